@@ -5,14 +5,18 @@ This is the main entry point that orchestrates the MVC architecture.
 import streamlit as st
 from pathlib import Path
 from models.database import init_db
-from views import (
-    render_dashboard,
-    render_add,
-    render_transactions,
-    render_analytics,
-    render_settings,
-    render_bottom_nav,
-)
+from utils.constants import TAB_IDS
+import views
+from views import render_bottom_nav
+
+# View functions are resolved lazily so only the active tab's module is imported.
+_ROUTES = {
+    "dashboard": "render_dashboard",
+    "add": "render_add",
+    "transactions": "render_transactions",
+    "analytics": "render_analytics",
+    "settings": "render_settings",
+}
 
 # Configure Streamlit page
 st.set_page_config(
@@ -21,39 +25,27 @@ st.set_page_config(
     layout="centered"
 )
 
-# Initialize database
+# Initialize database (cached, so DDL only runs on the first script run)
 init_db()
 
 
 def get_active_tab() -> str:
     """Get active tab from query parameters."""
-    params = st.query_params
-    tab = params.get("tab", "dashboard")
-    valid_tabs = {"dashboard", "transactions", "add", "analytics", "settings"}
-    if tab not in valid_tabs:
-        tab = "dashboard"
-    return tab
+    tab = st.query_params.get("tab", "dashboard")
+    return tab if tab in TAB_IDS else "dashboard"
 
 
 def main():
     """Main application entry point."""
     active_tab = get_active_tab()
 
-    # Route to appropriate view based on active tab
-    if active_tab == "dashboard":
-        render_dashboard()
-    elif active_tab == "add":
-        render_add()
-    elif active_tab == "transactions":
-        render_transactions()
-    elif active_tab == "analytics":
-        render_analytics()
-    elif active_tab == "settings":
-        render_settings()
-
-    # Render bottom navigation
+    # Render bottom navigation first; it is position: fixed, so emitting it
+    # ahead of the view keeps its element identity stable across tabs.
     render_bottom_nav(active_tab)
 
+    # Route to appropriate view based on active tab
+    getattr(views, _ROUTES[active_tab])()
+
 
 if __name__ == "__main__":
     main()
@@ -2,10 +2,17 @@
 from .database import init_db, get_engine
 from .expense import (
     insert_expense,
+    insert_expenses_bulk,
     get_expense,
     update_expense,
+    update_expenses_bulk,
     delete_expense,
+    delete_expenses,
+    Transaction,
     list_transactions,
+    count_transactions,
+    list_transactions_for_export,
+    spent_by_category_and_total,
     spent_by_category_for_month,
     spent_total_for_month,
 )
@@ -18,10 +25,17 @@ __all__ = [
     "init_db",
     "get_engine",
     "insert_expense",
+    "insert_expenses_bulk",
     "get_expense",
     "update_expense",
+    "update_expenses_bulk",
     "delete_expense",
+    "delete_expenses",
+    "Transaction",
     "list_transactions",
+    "count_transactions",
+    "list_transactions_for_export",
+    "spent_by_category_and_total",
     "spent_by_category_for_month",
     "spent_total_for_month",
     "get_settings",
@@ -1,152 +1,170 @@
 """Analytics data models."""
 import datetime as dt
+from functools import lru_cache
+import streamlit as st
 from sqlalchemy import text
-from .database import get_engine
+from utils.constants import CATEGORIES
+from .database import date_range_predicates, get_engine, search_predicate
 
+# CATEGORIES as a bound VALUES list (ord, name) for zero-filled pivots.
+_CATEGORY_VALUES = ", ".join(f"({i}, :cat{i})" for i in range(len(CATEGORIES)))
+_CATEGORY_PARAMS = {f"cat{i}": c for i, c in enumerate(CATEGORIES)}
 
+
+def _build_where(start_date: dt.date | None, end_date: dt.date | None, search: str = "") -> tuple[str, dict]:
+    """Build the shared date/search WHERE clause and its params."""
+    where_parts, params = date_range_predicates(start_date, end_date)
+    if search:
+        search_sql, search_params = search_predicate(search.lower())
+        where_parts.append(search_sql)
+        params.update(search_params)
+
+    where_sql = " AND ".join(where_parts) if where_parts else "1=1"
+    return where_sql, params
+
+
+# Filter-dependent statements are compiled once per WHERE shape.
+_MONTHLY_TOTALS_SQL = """
+    SELECT occurred_ym AS ym,
+           COALESCE(SUM(amount_cents), 0) AS total_cents
+    FROM expenses
+    WHERE {where_sql}
+    GROUP BY ym
+    ORDER BY ym DESC
+    LIMIT :limit;
+"""
+
+
+@lru_cache(maxsize=16)
+def _monthly_totals_stmt(where_sql: str):
+    return text(_MONTHLY_TOTALS_SQL.format(where_sql=where_sql))
+
+
+_MONTHLY_CATEGORY_TOTALS_SQL = """
+    WITH months AS (
+      SELECT e.occurred_ym AS ym
+      FROM expenses e
+      WHERE {where_sql}
+      GROUP BY ym
+      ORDER BY ym DESC
+      LIMIT :limit
+    ),
+    cats(ord, category) AS (VALUES {category_values}),
+    totals AS (
+      SELECT e.occurred_ym AS ym,
+             COALESCE(NULLIF(e.category, ''), 'misc') AS category,
+             SUM(e.amount_cents) AS total_cents
+      FROM expenses e
+      WHERE e.occurred_ym IN (SELECT ym FROM months)
+        AND {where_sql}
+      GROUP BY 1, 2
+    )
+    SELECT m.ym,
+           c.category,
+           COALESCE(t.total_cents, 0) AS total_cents
+    FROM cats c
+    CROSS JOIN months m
+    LEFT JOIN totals t ON t.ym = m.ym AND t.category = c.category
+    ORDER BY c.ord, m.ym;
+"""
+
+
+@lru_cache(maxsize=16)
+def _monthly_category_totals_stmt(where_sql: str):
+    return text(_MONTHLY_CATEGORY_TOTALS_SQL.format(where_sql=where_sql, category_values=_CATEGORY_VALUES))
+
+
+_KPI_METRICS_SQL = """
+    SELECT 
+        COALESCE(SUM(amount_cents), 0) AS total_cents,
+        COUNT(*) AS transaction_count,
+        COALESCE(AVG(amount_cents), 0) AS avg_cents,
+        MIN(occurred_at) AS first_date,
+        MAX(occurred_at) AS last_date
+    FROM expenses
+    WHERE {where_sql};
+"""
+
+
+@lru_cache(maxsize=16)
+def _kpi_metrics_stmt(where_sql: str):
+    return text(_KPI_METRICS_SQL.format(where_sql=where_sql))
+
+
+_WEEKLY_TOTALS = text(
+    """
+    SELECT occurred_yw AS yw,
+           COALESCE(SUM(amount_cents), 0) AS total_cents
+    FROM expenses
+    GROUP BY occurred_yw
+    ORDER BY occurred_yw DESC
+    LIMIT :limit;
+    """
+)
+# Unfiltered, so it reads the trigger-maintained monthly_summary.
+_MONTHLY_SAVINGS_RATE = text(
+    """
+    SELECT m.ym,
+           (s.income_1_cents + s.income_2_cents - SUM(m.total_cents)) * 100.0
+               / (s.income_1_cents + s.income_2_cents) AS savings_rate,
+           SUM(m.total_cents) AS spent_cents,
+           s.income_1_cents + s.income_2_cents AS income_cents
+    FROM monthly_summary m
+    CROSS JOIN settings s
+    WHERE s.id = 1
+      AND s.income_1_cents + s.income_2_cents > 0
+    GROUP BY m.ym
+    ORDER BY m.ym DESC
+    LIMIT :limit;
+    """
+)
+
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def monthly_totals(limit: int = 6, start_date: dt.date | None = None, end_date: dt.date | None = None, search: str = ""):
     """Get monthly spending totals with optional filters."""
     engine = get_engine()
-    
-    where_parts = []
-    params = {"limit": limit}
-    
-    if start_date:
-        where_parts.append("occurred_at >= :start")
-        params["start"] = dt.datetime.combine(start_date, dt.time(0, 0, 0)).isoformat()
-    
-    if end_date:
-        where_parts.append("occurred_at < :end")
-        end_excl = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time(0, 0, 0)).isoformat()
-        params["end"] = end_excl
-    
-    if search:
-        where_parts.append("(LOWER(COALESCE(note, '')) LIKE :q OR LOWER(COALESCE(category, '')) LIKE :q)")
-        params["q"] = f"%{search.lower()}%"
-    
-    where_sql = " AND ".join(where_parts) if where_parts else "1=1"
-    
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                f"""
-                SELECT substr(occurred_at, 1, 7) AS ym,
-                       COALESCE(SUM(amount_cents), 0) AS total_cents
-                FROM expenses
-                WHERE {where_sql}
-                GROUP BY ym
-                ORDER BY ym DESC
-                LIMIT :limit;
-                """
-            ),
-            params,
-        ).mappings()
-        return list(reversed(list(rows)))
+    where_sql, params = _build_where(start_date, end_date, search)
+    params["limit"] = limit
+
+    with engine.connect() as conn:
+        rows = conn.execute(_monthly_totals_stmt(where_sql), params).mappings()
+        return list(reversed([dict(r) for r in rows]))
 
 
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def weekly_totals(limit: int = 10):
     """Get weekly spending totals."""
     engine = get_engine()
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT strftime('%Y-W%W', occurred_at) AS yw,
-                       COALESCE(SUM(amount_cents), 0) AS total_cents
-                FROM expenses
-                GROUP BY yw
-                ORDER BY yw DESC
-                LIMIT :limit;
-                """
-            ),
-            {"limit": limit},
-        ).mappings()
-        return list(reversed(list(rows)))
+    with engine.connect() as conn:
+        rows = conn.execute(_WEEKLY_TOTALS, {"limit": limit}).mappings()
+        return list(reversed([dict(r) for r in rows]))
 
 
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def monthly_category_totals(limit_months: int = 6, start_date: dt.date | None = None, end_date: dt.date | None = None):
-    """Get monthly spending by category with optional filters."""
+    """Get monthly spending by category with optional filters.
+
+    The result is dense: one row per (category, month) ordered by CATEGORIES
+    then month, zero-filled, with blank categories counted as "misc".
+    """
     engine = get_engine()
-    
-    where_parts = []
-    params = {"limit": limit_months}
-    
-    if start_date:
-        where_parts.append("occurred_at >= :start")
-        params["start"] = dt.datetime.combine(start_date, dt.time(0, 0, 0)).isoformat()
-    
-    if end_date:
-        where_parts.append("occurred_at < :end")
-        end_excl = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time(0, 0, 0)).isoformat()
-        params["end"] = end_excl
-    
-    where_sql = " AND ".join(where_parts) if where_parts else "1=1"
-    
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                f"""
-                WITH months AS (
-                  SELECT substr(occurred_at, 1, 7) AS ym
-                  FROM expenses
-                  WHERE {where_sql}
-                  GROUP BY ym
-                  ORDER BY ym DESC
-                  LIMIT :limit
-                )
-                SELECT substr(occurred_at, 1, 7) AS ym,
-                       category,
-                       COALESCE(SUM(amount_cents), 0) AS total_cents
-                FROM expenses
-                WHERE substr(occurred_at, 1, 7) IN (SELECT ym FROM months)
-                  AND {where_sql}
-                GROUP BY ym, category
-                ORDER BY ym ASC;
-                """
-            ),
-            params,
-        ).mappings()
-        return list(rows)
+    where_sql, params = _build_where(start_date, end_date)
+    params.update(limit=limit_months, **_CATEGORY_PARAMS)
 
+    with engine.connect() as conn:
+        rows = conn.execute(_monthly_category_totals_stmt(where_sql), params).mappings()
+        return [dict(r) for r in rows]
 
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def get_kpi_metrics(start_date: dt.date | None = None, end_date: dt.date | None = None, search: str = ""):
     """Get KPI metrics for analytics dashboard."""
     engine = get_engine()
-    
-    where_parts = []
-    params = {}
-    
-    if start_date:
-        where_parts.append("occurred_at >= :start")
-        params["start"] = dt.datetime.combine(start_date, dt.time(0, 0, 0)).isoformat()
-    
-    if end_date:
-        where_parts.append("occurred_at < :end")
-        end_excl = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time(0, 0, 0)).isoformat()
-        params["end"] = end_excl
-    
-    if search:
-        where_parts.append("(LOWER(COALESCE(note, '')) LIKE :q OR LOWER(COALESCE(category, '')) LIKE :q)")
-        params["q"] = f"%{search.lower()}%"
-    
-    where_sql = " AND ".join(where_parts) if where_parts else "1=1"
-    
-    with engine.begin() as conn:
-        result = conn.execute(
-            text(
-                f"""
-                SELECT 
-                    COALESCE(SUM(amount_cents), 0) AS total_cents,
-                    COUNT(*) AS transaction_count,
-                    COALESCE(AVG(amount_cents), 0) AS avg_cents,
-                    MIN(occurred_at) AS first_date,
-                    MAX(occurred_at) AS last_date
-                FROM expenses
-                WHERE {where_sql};
-                """
-            ),
-            params,
-        ).mappings().first()
+    where_sql, params = _build_where(start_date, end_date, search)
+
+    with engine.connect() as conn:
+        result = conn.execute(_kpi_metrics_stmt(where_sql), params).mappings().first()
         
         return dict(result) if result else {
             "total_cents": 0,
@@ -157,52 +175,13 @@ def get_kpi_metrics(start_date: dt.date | None = None, end_date: dt.date | None
         }
 
 
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def monthly_savings_rate(limit: int = 12):
     """Get monthly savings rate (%) based on income and spending."""
     engine = get_engine()
-    
-    with engine.begin() as conn:
-        # Get settings for income calculation
-        settings_row = conn.execute(
-            text("SELECT income_1_cents, income_2_cents FROM settings WHERE id = 1;")
-        ).mappings().first()
-        
-        if not settings_row:
-            return []
-        
-        income_1_cents = int(settings_row.get("income_1_cents", 0) or 0)
-        income_2_cents = int(settings_row.get("income_2_cents", 0) or 0)
-        total_income_cents = income_1_cents + income_2_cents
-        
-        if total_income_cents <= 0:
-            return []
-        
-        # Get monthly spending
-        rows = conn.execute(
-            text(
-                """
-                SELECT substr(occurred_at, 1, 7) AS ym,
-                       COALESCE(SUM(amount_cents), 0) AS spent_cents
-                FROM expenses
-                GROUP BY ym
-                ORDER BY ym DESC
-                LIMIT :limit;
-                """
-            ),
-            {"limit": limit},
-        ).mappings()
-        
-        results = []
-        for row in rows:
-            spent_cents = int(row.get("spent_cents", 0) or 0)
-            savings_cents = total_income_cents - spent_cents
-            savings_rate = (savings_cents / total_income_cents * 100.0) if total_income_cents > 0 else 0.0
-            
-            results.append({
-                "ym": row["ym"],
-                "savings_rate": savings_rate,
-                "spent_cents": spent_cents,
-                "income_cents": total_income_cents
-            })
-        
-        return list(reversed(results))
+
+    with engine.connect() as conn:
+        # Income comes from the single settings row; months are skipped
+        # entirely when no income is configured.
+        rows = conn.execute(_MONTHLY_SAVINGS_RATE, {"limit": limit}).mappings()
+        return list(reversed([dict(r) for r in rows]))
@@ -1,38 +1,391 @@
 """Database connection and initialization."""
+import datetime as dt
 import os
 import time
 from sqlalchemy import create_engine, event, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import QueuePool
 import streamlit as st
 
 
+# Schema and maintenance statements are built once so SQLAlchemy's
+# compiled-statement cache can key on the same objects every call.
+_DDL_EXPENSES = text(
+    """
+    CREATE TABLE IF NOT EXISTS expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        amount_cents INTEGER NOT NULL,
+        currency TEXT NOT NULL,
+        category TEXT,
+        note TEXT,
+        occurred_at TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    );
+    """
+)
+# Month bucket ("YYYY-MM") for GROUP BY/IN filters. SQLite can only ALTER in a
+# VIRTUAL generated column; indexing it stores the computed values.
+_EXPENSES_COLUMNS = text("PRAGMA table_xinfo(expenses);")
+_ADD_OCCURRED_YM = text(
+    "ALTER TABLE expenses ADD COLUMN occurred_ym TEXT GENERATED ALWAYS AS (substr(occurred_at, 1, 7)) VIRTUAL;"
+)
+_DDL_IX_EXPENSES_YM = text("CREATE INDEX IF NOT EXISTS ix_expenses_ym ON expenses(occurred_ym);")
+# Week bucket ("YYYY-Www") for weekly_totals, built the same way.
+_ADD_OCCURRED_YW = text(
+    "ALTER TABLE expenses ADD COLUMN occurred_yw TEXT GENERATED ALWAYS AS (strftime('%Y-W%W', occurred_at)) VIRTUAL;"
+)
+_DDL_IX_EXPENSES_YW = text("CREATE INDEX IF NOT EXISTS ix_expenses_yw ON expenses(occurred_yw);")
+# (occurred_at, category) serves month range scans and their GROUP BY category;
+# it makes the older single-column occurred_at index redundant.
+_DDL_IX_EXPENSES_OCCURRED = text(
+    "CREATE INDEX IF NOT EXISTS ix_expenses_occurred_category ON expenses(occurred_at, category);"
+)
+_DROP_IX_EXPENSES_OCCURRED_AT = text("DROP INDEX IF EXISTS ix_expenses_occurred_at;")
+_DDL_IX_EXPENSES_CATEGORY = text(
+    "CREATE INDEX IF NOT EXISTS ix_expenses_category_occurred ON expenses(category, occurred_at);"
+)
+# Trigram full-text index over note/category: serves the transaction search's
+# substring matches (3+ chars) without scanning and lowercasing every row.
+_DDL_EXPENSES_FTS = text(
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS expenses_fts USING fts5(
+        note, category,
+        content='expenses', content_rowid='id', tokenize='trigram'
+    );
+    """
+)
+_DDL_EXPENSES_FTS_TRIGGERS = (
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_ai AFTER INSERT ON expenses BEGIN
+            INSERT INTO expenses_fts(rowid, note, category) VALUES (new.id, new.note, new.category);
+        END;
+        """
+    ),
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_ad AFTER DELETE ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, note, category)
+            VALUES ('delete', old.id, old.note, old.category);
+        END;
+        """
+    ),
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS expenses_fts_au AFTER UPDATE ON expenses BEGIN
+            INSERT INTO expenses_fts(expenses_fts, rowid, note, category)
+            VALUES ('delete', old.id, old.note, old.category);
+            INSERT INTO expenses_fts(rowid, note, category) VALUES (new.id, new.note, new.category);
+        END;
+        """
+    ),
+)
+_HAS_EXPENSES_FTS = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'expenses_fts';")
+_REBUILD_EXPENSES_FTS = text("INSERT INTO expenses_fts(expenses_fts) VALUES ('rebuild');")
+# Trigrams need at least this many characters to match anything.
+_FTS_MIN_CHARS = 3
+# Per-month, per-category spend kept current by triggers, so unfiltered month
+# reads (dashboard totals, savings rate) touch one row per month and category
+# instead of every expense. NULL categories are keyed as '' so upserts match.
+_DDL_MONTHLY_SUMMARY = text(
+    """
+    CREATE TABLE IF NOT EXISTS monthly_summary (
+        ym TEXT NOT NULL,
+        category TEXT NOT NULL,
+        total_cents INTEGER NOT NULL,
+        expense_count INTEGER NOT NULL,
+        PRIMARY KEY (ym, category)
+    ) WITHOUT ROWID;
+    """
+)
+_DDL_MONTHLY_SUMMARY_TRIGGERS = (
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS monthly_summary_ai AFTER INSERT ON expenses BEGIN
+            INSERT INTO monthly_summary (ym, category, total_cents, expense_count)
+            VALUES (substr(new.occurred_at, 1, 7), COALESCE(new.category, ''), new.amount_cents, 1)
+            ON CONFLICT (ym, category) DO UPDATE
+            SET total_cents = total_cents + excluded.total_cents,
+                expense_count = expense_count + 1;
+        END;
+        """
+    ),
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS monthly_summary_ad AFTER DELETE ON expenses BEGIN
+            UPDATE monthly_summary
+            SET total_cents = total_cents - old.amount_cents,
+                expense_count = expense_count - 1
+            WHERE ym = substr(old.occurred_at, 1, 7) AND category = COALESCE(old.category, '');
+            DELETE FROM monthly_summary
+            WHERE ym = substr(old.occurred_at, 1, 7) AND category = COALESCE(old.category, '')
+              AND expense_count <= 0;
+        END;
+        """
+    ),
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS monthly_summary_au
+        AFTER UPDATE OF amount_cents, category, occurred_at ON expenses BEGIN
+            UPDATE monthly_summary
+            SET total_cents = total_cents - old.amount_cents,
+                expense_count = expense_count - 1
+            WHERE ym = substr(old.occurred_at, 1, 7) AND category = COALESCE(old.category, '');
+            DELETE FROM monthly_summary
+            WHERE ym = substr(old.occurred_at, 1, 7) AND category = COALESCE(old.category, '')
+              AND expense_count <= 0;
+            INSERT INTO monthly_summary (ym, category, total_cents, expense_count)
+            VALUES (substr(new.occurred_at, 1, 7), COALESCE(new.category, ''), new.amount_cents, 1)
+            ON CONFLICT (ym, category) DO UPDATE
+            SET total_cents = total_cents + excluded.total_cents,
+                expense_count = expense_count + 1;
+        END;
+        """
+    ),
+)
+_HAS_MONTHLY_SUMMARY = text(
+    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'monthly_summary';"
+)
+_REBUILD_MONTHLY_SUMMARY = text(
+    """
+    INSERT INTO monthly_summary (ym, category, total_cents, expense_count)
+    SELECT substr(occurred_at, 1, 7), COALESCE(category, ''), SUM(amount_cents), COUNT(*)
+    FROM expenses
+    GROUP BY 1, 2;
+    """
+)
+_DDL_TAGS = text(
+    """
+    CREATE TABLE IF NOT EXISTS tags (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE
+    );
+    """
+)
+_DDL_EXPENSE_TAGS = text(
+    """
+    CREATE TABLE IF NOT EXISTS expense_tags (
+        expense_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (expense_id, tag_id),
+        FOREIGN KEY (expense_id) REFERENCES expenses(id) ON DELETE CASCADE,
+        FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
+    );
+    """
+)
+# expense_tags' primary key leads with expense_id; this serves tag -> expense
+# lookups (tag filters and tag analytics) without scanning the link table.
+_DDL_IX_EXPENSE_TAGS_TAG = text(
+    "CREATE INDEX IF NOT EXISTS ix_expense_tags_tag_expense ON expense_tags(tag_id, expense_id);"
+)
+# Same trigram index for tag names, so tag search matches by index too; an
+# external-content table over expenses cannot carry the tags themselves.
+_DDL_TAGS_FTS = text(
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5(
+        name, content='tags', content_rowid='id', tokenize='trigram'
+    );
+    """
+)
+_DDL_TAGS_FTS_TRIGGERS = (
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS tags_fts_ai AFTER INSERT ON tags BEGIN
+            INSERT INTO tags_fts(rowid, name) VALUES (new.id, new.name);
+        END;
+        """
+    ),
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS tags_fts_ad AFTER DELETE ON tags BEGIN
+            INSERT INTO tags_fts(tags_fts, rowid, name) VALUES ('delete', old.id, old.name);
+        END;
+        """
+    ),
+    # Tag upserts rewrite the name with itself; only real renames touch the index.
+    text(
+        """
+        CREATE TRIGGER IF NOT EXISTS tags_fts_au AFTER UPDATE OF name ON tags
+        WHEN old.name IS NOT new.name BEGIN
+            INSERT INTO tags_fts(tags_fts, rowid, name) VALUES ('delete', old.id, old.name);
+            INSERT INTO tags_fts(rowid, name) VALUES (new.id, new.name);
+        END;
+        """
+    ),
+)
+_HAS_TAGS_FTS = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tags_fts';")
+_REBUILD_TAGS_FTS = text("INSERT INTO tags_fts(tags_fts) VALUES ('rebuild');")
+_DDL_SETTINGS = text(
+    """
+    CREATE TABLE IF NOT EXISTS settings (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        income_1_cents INTEGER NOT NULL DEFAULT 0,
+        income_2_cents INTEGER NOT NULL DEFAULT 0,
+        saving_goal_pct REAL NOT NULL DEFAULT 0
+    );
+    """
+)
+_SETTINGS_COLUMNS = text("PRAGMA table_info(settings);")
+_ADD_BUDGET_COLUMNS = {
+    col_name: text(f"ALTER TABLE settings ADD COLUMN {col_name} INTEGER NOT NULL DEFAULT 0;")
+    for col_name in (
+        "budget_fun_cents",
+        "budget_groceris_cents",
+        "budget_travel_cents",
+        "budget_home_exp_cents",
+        "budget_misc_cents",
+    )
+}
+# Bump when the migrations in _migrate_schema change; databases already at
+# this version skip the table_info checks and DDL on startup.
+_SCHEMA_VERSION = 2
+_GET_SCHEMA_VERSION = text("PRAGMA user_version;")
+_SET_SCHEMA_VERSION = text(f"PRAGMA user_version = {_SCHEMA_VERSION};")
+_ANALYZE_EXPENSES = text("ANALYZE expenses;")
+_ANALYZE_EXPENSE_TAGS = text("ANALYZE expense_tags;")
+_SEED_SETTINGS = text(
+    """
+    INSERT OR IGNORE INTO settings (id, income_1_cents, income_2_cents, saving_goal_pct)
+    VALUES (1, 0, 0, 0);
+    """
+)
+_RESET_STATEMENTS = (
+    text("DELETE FROM expense_tags;"),
+    text("DELETE FROM tags;"),
+    text("DELETE FROM expenses;"),
+    text(
+        """
+        UPDATE settings
+        SET income_1_cents = 0,
+            income_2_cents = 0,
+            saving_goal_pct = 0,
+            budget_fun_cents = 0,
+            budget_groceris_cents = 0,
+            budget_travel_cents = 0,
+            budget_home_exp_cents = 0,
+            budget_misc_cents = 0
+        WHERE id = 1;
+        """
+    ),
+)
+
+
 def _database_url() -> str:
     return os.getenv("DATABASE_URL", "sqlite:///moneypal.db")
 
 
-@st.cache_resource
-def get_engine():
-    """Get SQLAlchemy engine with SQLite optimizations."""
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Per-connection SQLite tuning (WAL, fsync level, memory use)."""
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL;")
+        cursor.execute("PRAGMA synchronous=NORMAL;")
+        cursor.execute("PRAGMA busy_timeout=5000;")
+        # Keep temp b-trees (GROUP BY/ORDER BY) in memory, read hot pages
+        # through a 256 MiB mmap, and allow ~20 MB of page cache.
+        cursor.execute("PRAGMA temp_store=MEMORY;")
+        cursor.execute("PRAGMA mmap_size=268435456;")
+        cursor.execute("PRAGMA cache_size=-20000;")
+        cursor.close()
+    except Exception:
+        pass
+
+
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    """Stop pysqlite from issuing its own deferred BEGIN; _begin_sqlite does it."""
+    dbapi_connection.isolation_level = None
+
+
+def _begin_sqlite(conn):
+    """Start each transaction explicitly, taking the write lock up front for writers.
+
+    A deferred transaction that later writes has to upgrade its lock, which is
+    what surfaces as "database is locked" under WAL; BEGIN IMMEDIATE waits on
+    busy_timeout for the lock instead.
+    """
+    conn.exec_driver_sql("BEGIN IMMEDIATE" if conn.get_execution_options().get("sqlite_immediate") else "BEGIN")
+
+
+def _set_query_only(dbapi_connection, connection_record):
+    """Reader connections refuse writes, so every write has to go through begin_write()."""
+    dbapi_connection.execute("PRAGMA query_only=ON;")
+
+
+def _create_sqlite_engine(url: str, *, pool_size: int, max_overflow: int, **kwargs):
+    """Pooled SQLite engine with the shared pragmas and explicit BEGIN handling."""
+    # Pooled connections keep their pragmas and sqlite3's per-connection
+    # prepared-statement cache, sized above the app's distinct statements.
     engine = create_engine(
-        _database_url(),
+        url,
         future=True,
-        connect_args={"check_same_thread": False, "timeout": 30},
+        poolclass=QueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        query_cache_size=1200,
+        connect_args={"check_same_thread": False, "timeout": 30, "cached_statements": 256},
+        **kwargs,
     )
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(engine, "connect", _disable_pysqlite_begin)
+    event.listen(engine, "begin", _begin_sqlite)
+    return engine
 
-    @event.listens_for(engine, "connect")
-    def _set_sqlite_pragmas(dbapi_connection, connection_record):
-        try:
-            cursor = dbapi_connection.cursor()
-            cursor.execute("PRAGMA journal_mode=WAL;")
-            cursor.execute("PRAGMA synchronous=NORMAL;")
-            cursor.execute("PRAGMA busy_timeout=5000;")
-            cursor.close()
-        except Exception:
-            pass
+
+@st.cache_resource
+def get_engine():
+    """Get SQLAlchemy engine with SQLite optimizations.
+
+    On SQLite this is the read pool; writes go through begin_write().
+    """
+    url = _database_url()
+    if url.startswith("sqlite"):
+        # Streamlit runs each session on its own thread, so keep a small
+        # pool of shareable connections instead of opening one per checkout.
+        # WAL lets these readers run while the writer commits.
+        engine = _create_sqlite_engine(url, pool_size=5, max_overflow=10)
+        event.listen(engine, "connect", _set_query_only)
+    else:
+        engine = create_engine(
+            url,
+            future=True,
+            pool_size=5,
+            max_overflow=10,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+        )
 
     return engine
 
 
+@st.cache_resource
+def _get_write_engine():
+    """Engine for write transactions.
+
+    SQLite admits one writer at a time, so a single pooled connection makes
+    in-process writers queue on the pool instead of contending for the lock.
+    """
+    url = _database_url()
+    if not url.startswith("sqlite"):
+        return get_engine()
+    return _create_sqlite_engine(
+        url,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=30,
+        execution_options={"sqlite_immediate": True},
+    )
+
+
+def begin_write():
+    """Open a write transaction (BEGIN IMMEDIATE on SQLite); use like engine.begin()."""
+    return _get_write_engine().begin()
+
+
+def clear_query_cache() -> None:
+    """Drop memoized query results; call after every write."""
+    st.cache_data.clear()
+
+
 def with_sqlite_retry(fn, retries: int = 6, base_sleep_s: float = 0.08):
     """Retry wrapper for SQLite operations that may encounter locks."""
     last_exc: Exception | None = None
@@ -50,108 +403,108 @@ def with_sqlite_retry(fn, retries: int = 6, base_sleep_s: float = 0.08):
     raise RuntimeError("SQLite retry failed")
 
 
-def init_db() -> None:
-    """Initialize database tables and run migrations."""
-    engine = get_engine()
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS expenses (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    amount_cents INTEGER NOT NULL,
-                    currency TEXT NOT NULL,
-                    category TEXT,
-                    note TEXT,
-                    occurred_at TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                """
-            )
-        )
+def date_range_predicates(
+    start_date: dt.date | None,
+    end_date: dt.date | None,
+    alias: str = "",
+) -> tuple[list[str], dict]:
+    """occurred_at bounds for an inclusive date range, bound as `start` and an exclusive `end`."""
+    col = f"{alias}." if alias else ""
+    parts: list[str] = []
+    params: dict = {}
+    if start_date is not None:
+        parts.append(f"{col}occurred_at >= :start")
+        params["start"] = dt.datetime.combine(start_date, dt.time(0, 0, 0)).isoformat()
+    if end_date is not None:
+        parts.append(f"{col}occurred_at < :end")
+        params["end"] = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time(0, 0, 0)).isoformat()
+    return parts, params
 
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS tags (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE
-                );
-                """
-            )
-        )
 
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS expense_tags (
-                    expense_id INTEGER NOT NULL,
-                    tag_id INTEGER NOT NULL,
-                    PRIMARY KEY (expense_id, tag_id),
-                    FOREIGN KEY (expense_id) REFERENCES expenses(id) ON DELETE CASCADE,
-                    FOREIGN KEY (tag_id) REFERENCES tags(id) ON DELETE CASCADE
-                );
-                """
-            )
-        )
+def fts_phrase(q: str) -> str | None:
+    """Quote `q` as an FTS5 phrase, or None when it is too short for the trigram index."""
+    if len(q) < _FTS_MIN_CHARS:
+        return None
+    return '"' + q.replace('"', '""') + '"'
 
-        conn.execute(
-            text(
-                """
-                CREATE TABLE IF NOT EXISTS settings (
-                    id INTEGER PRIMARY KEY CHECK (id = 1),
-                    income_1_cents INTEGER NOT NULL DEFAULT 0,
-                    income_2_cents INTEGER NOT NULL DEFAULT 0,
-                    saving_goal_pct REAL NOT NULL DEFAULT 0
-                );
-                """
-            )
-        )
 
-        existing_cols = {
-            r["name"]
-            for r in conn.execute(text("PRAGMA table_info(settings);")).mappings().all()
-        }
-        for col_name in [
-            "budget_fun_cents",
-            "budget_groceris_cents",
-            "budget_travel_cents",
-            "budget_home_exp_cents",
-            "budget_misc_cents",
-        ]:
-            if col_name not in existing_cols:
-                conn.execute(text(f"ALTER TABLE settings ADD COLUMN {col_name} INTEGER NOT NULL DEFAULT 0;"))
-
-        conn.execute(
-            text(
-                """
-                INSERT OR IGNORE INTO settings (id, income_1_cents, income_2_cents, saving_goal_pct)
-                VALUES (1, 0, 0, 0);
-                """
-            )
-        )
+def search_predicate(q: str, alias: str = "") -> tuple[str, dict]:
+    """Match lowercased `q` against expense note/category.
+
+    Returns (sql, params): an expenses_fts match bound as `fts` when the trigram
+    index can answer `q`, otherwise a LIKE scan bound as `q`.
+    """
+    col = f"{alias}." if alias else ""
+    phrase = fts_phrase(q)
+    if phrase is not None:
+        return f"{col}id IN (SELECT rowid FROM expenses_fts WHERE expenses_fts MATCH :fts)", {"fts": phrase}
+    return (
+        f"(LOWER(COALESCE({col}note, '')) LIKE :q OR LOWER(COALESCE({col}category, '')) LIKE :q)",
+        {"q": f"%{q}%"},
+    )
+
+
+def _migrate_schema(conn) -> None:
+    """Create tables, indexes and FTS tables, and add any missing columns."""
+    conn.execute(_DDL_EXPENSES)
+    expense_cols = {r["name"] for r in conn.execute(_EXPENSES_COLUMNS).mappings().all()}
+    if "occurred_ym" not in expense_cols:
+        conn.execute(_ADD_OCCURRED_YM)
+    if "occurred_yw" not in expense_cols:
+        conn.execute(_ADD_OCCURRED_YW)
+    conn.execute(_DDL_IX_EXPENSES_YM)
+    conn.execute(_DDL_IX_EXPENSES_YW)
+    conn.execute(_DDL_IX_EXPENSES_OCCURRED)
+    conn.execute(_DROP_IX_EXPENSES_OCCURRED_AT)
+    conn.execute(_DDL_IX_EXPENSES_CATEGORY)
+
+    # Index rows that predate the FTS table; the triggers keep it in sync afterwards.
+    fts_exists = conn.execute(_HAS_EXPENSES_FTS).first() is not None
+    conn.execute(_DDL_EXPENSES_FTS)
+    for stmt in _DDL_EXPENSES_FTS_TRIGGERS:
+        conn.execute(stmt)
+    if not fts_exists:
+        conn.execute(_REBUILD_EXPENSES_FTS)
+    summary_exists = conn.execute(_HAS_MONTHLY_SUMMARY).first() is not None
+    conn.execute(_DDL_MONTHLY_SUMMARY)
+    for stmt in _DDL_MONTHLY_SUMMARY_TRIGGERS:
+        conn.execute(stmt)
+    if not summary_exists:
+        conn.execute(_REBUILD_MONTHLY_SUMMARY)
+    conn.execute(_DDL_TAGS)
+    tags_fts_exists = conn.execute(_HAS_TAGS_FTS).first() is not None
+    conn.execute(_DDL_TAGS_FTS)
+    for stmt in _DDL_TAGS_FTS_TRIGGERS:
+        conn.execute(stmt)
+    if not tags_fts_exists:
+        conn.execute(_REBUILD_TAGS_FTS)
+    conn.execute(_DDL_EXPENSE_TAGS)
+    conn.execute(_DDL_IX_EXPENSE_TAGS_TAG)
+    conn.execute(_DDL_SETTINGS)
+
+    existing_cols = {r["name"] for r in conn.execute(_SETTINGS_COLUMNS).mappings().all()}
+    for col_name, stmt in _ADD_BUDGET_COLUMNS.items():
+        if col_name not in existing_cols:
+            conn.execute(stmt)
+
+    conn.execute(_SEED_SETTINGS)
+
+
+@st.cache_resource
+def init_db() -> None:
+    """Initialize database tables and run migrations (once per process)."""
+    with begin_write() as conn:
+        # Read under the write lock so concurrent starts migrate only once.
+        if conn.execute(_GET_SCHEMA_VERSION).scalar_one() < _SCHEMA_VERSION:
+            _migrate_schema(conn)
+            conn.execute(_SET_SCHEMA_VERSION)
+        conn.execute(_ANALYZE_EXPENSES)
+        conn.execute(_ANALYZE_EXPENSE_TAGS)
 
 
 def reset_all_data() -> None:
     """Delete all expenses, tags, and reset settings."""
-    engine = get_engine()
-    with engine.begin() as conn:
-        conn.execute(text("DELETE FROM expense_tags;"))
-        conn.execute(text("DELETE FROM tags;"))
-        conn.execute(text("DELETE FROM expenses;"))
-        conn.execute(
-            text(
-                """
-                UPDATE settings
-                SET income_1_cents = 0,
-                    income_2_cents = 0,
-                    saving_goal_pct = 0,
-                    budget_fun_cents = 0,
-                    budget_groceris_cents = 0,
-                    budget_travel_cents = 0,
-                    budget_home_exp_cents = 0,
-                    budget_misc_cents = 0
-                WHERE id = 1;
-                """
-            )
-        )
+    with begin_write() as conn:
+        for stmt in _RESET_STATEMENTS:
+            conn.execute(stmt)
+    clear_query_cache()
@@ -1,65 +1,95 @@
 """Expense management models."""
 import datetime as dt
-from sqlalchemy import text
-from .database import get_engine
+from collections import namedtuple
+from functools import lru_cache
+from sqlalchemy import bindparam, text
+import streamlit as st
+from utils.constants import CATEGORIES
+from utils.helpers import to_cents
+from .database import begin_write, clear_query_cache, date_range_predicates, get_engine, search_predicate
 from .tags import set_expense_tags
 
 
+_INSERT_EXPENSE = text(
+    """
+    INSERT INTO expenses (amount_cents, currency, category, note, occurred_at, created_at)
+    VALUES (:amount_cents, :currency, :category, :note, :occurred_at, :created_at);
+    """
+)
+
+
 def insert_expense(*, item_name: str, amount: float, category: str, occurred_on: dt.date, tags: list[str] | None = None) -> None:
     """Insert a new expense."""
-    engine = get_engine()
-    occurred_at = dt.datetime.combine(occurred_on, dt.time(0, 0, 0)).isoformat()
+    insert_expenses_bulk(
+        [{"item_name": item_name, "amount": amount, "category": category, "occurred_on": occurred_on, "tags": tags}]
+    )
+
+
+def insert_expenses_bulk(rows: list[dict]) -> None:
+    """Insert many expenses in a single transaction.
+
+    Each row takes the same keys as insert_expense's arguments. Consecutive
+    untagged rows go through one executemany; tagged rows are inserted one at
+    a time since their new id is needed to link the tags.
+    """
+    if not rows:
+        return
     created_at = dt.datetime.now().isoformat()
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                INSERT INTO expenses (amount_cents, currency, category, note, occurred_at, created_at)
-                VALUES (:amount_cents, :currency, :category, :note, :occurred_at, :created_at);
-                """
-            ),
-            {
-                "amount_cents": int(amount * 100),
-                "currency": "USD",
-                "category": category,
-                "note": item_name,
-                "occurred_at": occurred_at,
-                "created_at": created_at,
-            },
-        )
-        expense_id = int(conn.execute(text("SELECT last_insert_rowid() AS id;")).mappings().first()["id"])
-        set_expense_tags(conn, expense_id=expense_id, tags=list(tags or []))
+    params = [
+        {
+            "amount_cents": to_cents(r["amount"]),
+            "currency": "USD",
+            "category": r["category"],
+            "note": r["item_name"],
+            "occurred_at": dt.datetime.combine(r["occurred_on"], dt.time(0, 0, 0)).isoformat(),
+            "created_at": created_at,
+        }
+        for r in rows
+    ]
+
+    with begin_write() as conn:
+        pending: list[dict] = []
+        for r, p in zip(rows, params):
+            if not r.get("tags"):
+                pending.append(p)
+                continue
+            if pending:
+                conn.execute(_INSERT_EXPENSE, pending)
+                pending = []
+            expense_id = int(conn.execute(_INSERT_EXPENSE, p).lastrowid)
+            set_expense_tags(conn, expense_id=expense_id, tags=list(r["tags"]))
+        if pending:
+            conn.execute(_INSERT_EXPENSE, pending)
+    clear_query_cache()
+
+
+_GET_EXPENSE = text(
+    """
+    SELECT id, occurred_at, note, category, amount_cents
+    FROM expenses
+    WHERE id = :id;
+    """
+)
+_GET_EXPENSE_TAGS = text(
+    """
+    SELECT t.name AS name
+    FROM expense_tags et
+    JOIN tags t ON t.id = et.tag_id
+    WHERE et.expense_id = :id
+    ORDER BY LOWER(t.name) ASC;
+    """
+)
 
 
 def get_expense(expense_id: int) -> dict | None:
     """Get expense by ID with tags."""
     engine = get_engine()
-    with engine.begin() as conn:
-        row = conn.execute(
-            text(
-                """
-                SELECT id, occurred_at, note, category, amount_cents
-                FROM expenses
-                WHERE id = :id;
-                """
-            ),
-            {"id": int(expense_id)},
-        ).mappings().first()
+    with engine.connect() as conn:
+        row = conn.execute(_GET_EXPENSE, {"id": int(expense_id)}).mappings().first()
         if not row:
             return None
 
-        tags_rows = conn.execute(
-            text(
-                """
-                SELECT t.name AS name
-                FROM expense_tags et
-                JOIN tags t ON t.id = et.tag_id
-                WHERE et.expense_id = :id
-                ORDER BY LOWER(t.name) ASC;
-                """
-            ),
-            {"id": int(expense_id)},
-        ).mappings().all()
+        tags_rows = conn.execute(_GET_EXPENSE_TAGS, {"id": int(expense_id)}).mappings().all()
         d = dict(row)
         d["tags"] = [str(r.get("name") or "") for r in tags_rows if (r.get("name") or "").strip()]
         return d
@@ -75,145 +105,289 @@ def update_expense(
     tags: list[str] | None = None,
 ) -> None:
     """Update an existing expense."""
-    engine = get_engine()
-    occurred_at = dt.datetime.combine(occurred_on, dt.time(0, 0, 0)).isoformat()
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                UPDATE expenses
-                   SET amount_cents = :amount_cents,
-                       category = :category,
-                       note = :note,
-                       occurred_at = :occurred_at
-                 WHERE id = :id;
-                """
-            ),
+    update_expenses_bulk(
+        [
             {
-                "id": int(expense_id),
-                "amount_cents": int(amount * 100),
+                "expense_id": expense_id,
+                "item_name": item_name,
+                "amount": amount,
                 "category": category,
-                "note": item_name.strip(),
-                "occurred_at": occurred_at,
-            },
-        )
-        set_expense_tags(conn, expense_id=int(expense_id), tags=list(tags or []))
+                "occurred_on": occurred_on,
+                "tags": list(tags or []),
+            }
+        ]
+    )
+
+
+_UPDATE_EXPENSE = text(
+    """
+    UPDATE expenses
+       SET amount_cents = :amount_cents,
+           category = :category,
+           note = :note,
+           occurred_at = :occurred_at
+     WHERE id = :id;
+    """
+)
+
+
+def update_expenses_bulk(rows: list[dict]) -> None:
+    """Update many expenses in a single transaction.
+
+    Each row takes update_expense's arguments; tags are only rewritten for
+    rows that include a "tags" key.
+    """
+    if not rows:
+        return
+    params = [
+        {
+            "id": int(r["expense_id"]),
+            "amount_cents": to_cents(r["amount"]),
+            "category": r["category"],
+            "note": r["item_name"].strip(),
+            "occurred_at": dt.datetime.combine(r["occurred_on"], dt.time(0, 0, 0)).isoformat(),
+        }
+        for r in rows
+    ]
+
+    with begin_write() as conn:
+        conn.execute(_UPDATE_EXPENSE, params)
+        for r in rows:
+            if "tags" in r:
+                set_expense_tags(conn, expense_id=int(r["expense_id"]), tags=list(r["tags"] or []))
+    clear_query_cache()
 
 
 def delete_expense(expense_id: int) -> None:
     """Delete an expense."""
-    engine = get_engine()
-    with engine.begin() as conn:
-        conn.execute(text("DELETE FROM expenses WHERE id = :id;"), {"id": int(expense_id)})
+    delete_expenses([expense_id])
+
+
+_DELETE_EXPENSE_TAGS = text("DELETE FROM expense_tags WHERE expense_id IN :ids;").bindparams(
+    bindparam("ids", expanding=True)
+)
+_DELETE_EXPENSES = text("DELETE FROM expenses WHERE id IN :ids;").bindparams(bindparam("ids", expanding=True))
+
+
+def delete_expenses(expense_ids: list[int]) -> None:
+    """Delete many expenses (and their tag links) in a single transaction."""
+    ids = [int(i) for i in expense_ids]
+    if not ids:
+        return
+    with begin_write() as conn:
+        conn.execute(_DELETE_EXPENSE_TAGS, {"ids": ids})
+        conn.execute(_DELETE_EXPENSES, {"ids": ids})
+    clear_query_cache()
+
+
+# Row type returned by list_transactions; plain tuples are cheaper than
+# RowMapping wrappers for the (up to thousands of) listed rows.
+Transaction = namedtuple(
+    "Transaction",
+    ["id", "occurred_at", "note", "category", "amount_cents", "tags", "ym", "month_subtotal"],
+)
+
+# The WHERE clause varies with the active filters; each distinct shape is
+# compiled into a text() once and reused. Tags are matched through subqueries
+# and fetched separately, so the main query never groups over the tag join.
+_LIST_TRANSACTIONS_SQL = """
+    SELECT e.id,
+           e.occurred_at,
+           e.note,
+           e.category,
+           e.amount_cents,
+           e.occurred_ym AS ym,
+           SUM(e.amount_cents) OVER (PARTITION BY e.occurred_ym) AS month_subtotal
+    FROM expenses e
+    {where_sql}
+    ORDER BY e.occurred_at DESC, e.id DESC
+    LIMIT :limit OFFSET :offset;
+"""
+_COUNT_TRANSACTIONS_SQL = """
+    SELECT COUNT(*) FROM expenses e
+    {where_sql};
+"""
+_EXPENSE_IDS_WITH_TAG_LIKE = """
+    e.id IN (
+        SELECT et.expense_id FROM expense_tags et JOIN tags t ON t.id = et.tag_id
+        WHERE LOWER(t.name) LIKE :q
+    )
+"""
+_EXPENSE_IDS_WITH_TAG_FTS = """
+    e.id IN (
+        SELECT et.expense_id FROM expense_tags et
+        WHERE et.tag_id IN (SELECT rowid FROM tags_fts WHERE tags_fts MATCH :fts)
+    )
+"""
+_EXPENSE_IDS_WITH_TAG = """
+    e.id IN (
+        SELECT et.expense_id FROM expense_tags et JOIN tags t ON t.id = et.tag_id
+        WHERE LOWER(t.name) = LOWER(:tag)
+    )
+"""
+_TAGS_FOR_EXPENSES = text(
+    """
+    SELECT et.expense_id, t.name
+    FROM expense_tags et
+    JOIN tags t ON t.id = et.tag_id
+    WHERE et.expense_id IN :ids
+    ORDER BY et.expense_id, et.tag_id;
+    """
+).bindparams(bindparam("ids", expanding=True))
+# Keep each IN list well under SQLite's bound-parameter limit.
+_TAG_LOOKUP_BATCH = 500
+
+
+@lru_cache(maxsize=32)
+def _list_transactions_stmt(where_sql: str):
+    return text(_LIST_TRANSACTIONS_SQL.format(where_sql=where_sql))
+
+
+@lru_cache(maxsize=32)
+def _count_transactions_stmt(where_sql: str):
+    return text(_COUNT_TRANSACTIONS_SQL.format(where_sql=where_sql))
 
 
+def _transactions_where(
+    search: str,
+    start_date: dt.date | None,
+    end_date: dt.date | None,
+    tag: str | None,
+) -> tuple[str, dict]:
+    """Build the WHERE clause and its params for the transaction filters."""
+    q = (search or "").strip().lower()
+    tag_value = (tag or "").strip()
+
+    where_parts, params = date_range_predicates(start_date, end_date, "e")
+
+    if q:
+        text_match, search_params = search_predicate(q, "e")
+        # Tags get the same kind of match, bound to the same parameter.
+        tag_match = _EXPENSE_IDS_WITH_TAG_FTS if "fts" in search_params else _EXPENSE_IDS_WITH_TAG_LIKE
+        where_parts.append(f"({text_match} OR {tag_match.strip()})")
+        params.update(search_params)
+
+    if tag_value:
+        where_parts.append(_EXPENSE_IDS_WITH_TAG.strip())
+        params["tag"] = tag_value
+
+    where_sql = "" if not where_parts else ("WHERE " + " AND ".join(where_parts))
+    return where_sql, params
+
+
+def _tags_by_expense(conn, expense_ids: list[int]) -> dict[int, str]:
+    """Map expense id -> comma-joined tag names for the given expenses."""
+    names: dict[int, list[str]] = {}
+    for i in range(0, len(expense_ids), _TAG_LOOKUP_BATCH):
+        batch = expense_ids[i:i + _TAG_LOOKUP_BATCH]
+        for expense_id, name in conn.execute(_TAGS_FOR_EXPENSES, {"ids": batch}):
+            names.setdefault(expense_id, []).append(name)
+    return {expense_id: ", ".join(tags) for expense_id, tags in names.items()}
+
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def list_transactions(
     *,
     search: str = "",
     limit: int = 500,
+    offset: int = 0,
     start_date: dt.date | None = None,
     end_date: dt.date | None = None,
     tag: str | None = None,
 ):
-    """List transactions with optional filters."""
+    """List transactions with optional filters.
+
+    Rows are Transaction tuples, newest first, each carrying its month (`ym`) and that month's
+    `month_subtotal` over all matching rows, so callers can group in one pass. `limit` and
+    `offset` select a page; subtotals still cover every matching row.
+    """
     engine = get_engine()
-    q = (search or "").strip().lower()
-    tag_value = (tag or "").strip()
+    where_sql, params = _transactions_where(search, start_date, end_date, tag)
+    params.update(limit=int(limit), offset=int(offset))
 
-    where_parts: list[str] = []
-    params: dict = {"limit": int(limit)}
+    with engine.connect() as conn:
+        rows = conn.execute(_list_transactions_stmt(where_sql), params).all()
+        tags = _tags_by_expense(conn, [r[0] for r in rows])
+    return [
+        Transaction(id_, occurred_at, note, category, amount_cents, tags.get(id_, ""), ym, month_subtotal)
+        for id_, occurred_at, note, category, amount_cents, ym, month_subtotal in rows
+    ]
 
-    if q:
-        where_parts.append(
-            "(LOWER(COALESCE(e.note, '')) LIKE :q OR LOWER(COALESCE(e.category, '')) LIKE :q OR LOWER(COALESCE(t.name, '')) LIKE :q)"
-        )
-        params["q"] = f"%{q}%"
 
-    if start_date is not None:
-        params["start"] = dt.datetime.combine(start_date, dt.time(0, 0, 0)).isoformat()
-        where_parts.append("e.occurred_at >= :start")
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def count_transactions(
+    *,
+    search: str = "",
+    start_date: dt.date | None = None,
+    end_date: dt.date | None = None,
+    tag: str | None = None,
+) -> int:
+    """Count the transactions list_transactions would return without a limit."""
+    engine = get_engine()
+    where_sql, params = _transactions_where(search, start_date, end_date, tag)
+    with engine.connect() as conn:
+        return int(conn.execute(_count_transactions_stmt(where_sql), params).scalar_one())
 
-    if end_date is not None:
-        end_excl = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time(0, 0, 0)).isoformat()
-        params["end"] = end_excl
-        where_parts.append("e.occurred_at < :end")
 
-    if tag_value:
-        where_parts.append("LOWER(t.name) = LOWER(:tag)")
-        params["tag"] = tag_value
+_EXPORT_TRANSACTIONS = text(
+    """
+    SELECT COALESCE(date(occurred_at), '') AS date,
+           trim(COALESCE(note, '')) AS item,
+           trim(COALESCE(category, '')) AS category,
+           printf('%.2f', COALESCE(amount_cents, 0) / 100.0) AS price
+    FROM expenses
+    ORDER BY occurred_at DESC, id DESC;
+    """
+)
 
-    where_sql = "" if not where_parts else ("WHERE " + " AND ".join(where_parts))
 
-    sql = f"""
-        SELECT e.id,
-               e.occurred_at,
-               e.note,
-               e.category,
-               e.amount_cents,
-               COALESCE(GROUP_CONCAT(t.name, ', '), '') AS tags
-        FROM expenses e
-        LEFT JOIN expense_tags et ON et.expense_id = e.id
-        LEFT JOIN tags t ON t.id = et.tag_id
-        {where_sql}
-        GROUP BY e.id
-        ORDER BY e.occurred_at DESC, e.id DESC
-        LIMIT :limit;
+def list_transactions_for_export(batch_size: int = 10_000):
+    """Yield every expense as a (date, item, category, price) tuple of strings, newest first.
+
+    Formatting happens in SQL and rows are fetched in batches, so the export
+    can be streamed straight into a csv writer.
     """
+    engine = get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(_EXPORT_TRANSACTIONS)
+        while batch := result.fetchmany(batch_size):
+            yield from map(tuple, batch)
 
-    with engine.begin() as conn:
-        rows = conn.execute(text(sql), params).mappings()
-        return list(rows)
 
+# One summary row per category that has spending this month.
+_SPENT_BY_CATEGORY = text(
+    """
+    SELECT category, total_cents AS spent_cents
+    FROM monthly_summary
+    WHERE ym = :ym;
+    """
+)
 
-def spent_by_category_for_month(today: dt.date) -> dict:
-    """Get spending by category for current month."""
+
+@st.cache_data(ttl=600, show_spinner=False)
+def spent_by_category_and_total(today: dt.date) -> tuple[dict, int]:
+    """Get per-category spending and the overall total for the current month."""
     engine = get_engine()
-    start = dt.datetime(today.year, today.month, 1).isoformat()
-    if today.month == 12:
-        end = dt.datetime(today.year + 1, 1, 1).isoformat()
-    else:
-        end = dt.datetime(today.year, today.month + 1, 1).isoformat()
-
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT category, COALESCE(SUM(amount_cents), 0) AS spent_cents
-                FROM expenses
-                WHERE occurred_at >= :start AND occurred_at < :end
-                GROUP BY category;
-                """
-            ),
-            {"start": start, "end": end},
-        ).mappings()
-        
-        from utils.constants import CATEGORIES
-        result = {c: 0 for c in CATEGORIES}
+    with engine.connect() as conn:
+        rows = conn.execute(_SPENT_BY_CATEGORY, {"ym": today.strftime("%Y-%m")}).mappings()
+
+        result = dict.fromkeys(CATEGORIES, 0)
+        # The total covers every row, including categories outside CATEGORIES.
+        total = 0
         for r in rows:
+            spent = int(r["spent_cents"] or 0)
+            total += spent
             cat = r["category"]
             if cat in result:
-                result[cat] = int(r["spent_cents"] or 0)
-        return result
+                result[cat] = spent
+        return result, total
+
+
+def spent_by_category_for_month(today: dt.date) -> dict:
+    """Get spending by category for current month."""
+    return spent_by_category_and_total(today)[0]
 
 
 def spent_total_for_month(today: dt.date) -> int:
     """Get total spending for current month."""
-    engine = get_engine()
-    start = dt.datetime(today.year, today.month, 1).isoformat()
-    if today.month == 12:
-        end = dt.datetime(today.year + 1, 1, 1).isoformat()
-    else:
-        end = dt.datetime(today.year, today.month + 1, 1).isoformat()
-
-    with engine.begin() as conn:
-        v = conn.execute(
-            text(
-                """
-                SELECT COALESCE(SUM(amount_cents), 0) AS total_cents
-                FROM expenses
-                WHERE occurred_at >= :start AND occurred_at < :end;
-                """
-            ),
-            {"start": start, "end": end},
-        ).mappings().first()
-        return int(v["total_cents"] or 0) if v else 0
+    return spent_by_category_and_total(today)[1]
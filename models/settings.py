@@ -1,27 +1,41 @@
 """Settings management models."""
+import streamlit as st
 from sqlalchemy import text
-from .database import get_engine
+from utils.helpers import to_cents
+from .database import begin_write, clear_query_cache, get_engine
 
 
+_GET_SETTINGS = text(
+    """
+    SELECT income_1_cents, income_2_cents, saving_goal_pct,
+           budget_fun_cents, budget_groceris_cents, budget_travel_cents,
+           budget_home_exp_cents, budget_misc_cents
+    FROM settings
+    WHERE id = 1;
+    """
+)
+_SAVE_SETTINGS = text(
+    """
+    UPDATE settings
+    SET income_1_cents = :income_1_cents,
+        income_2_cents = :income_2_cents,
+        saving_goal_pct = :saving_goal_pct,
+        budget_fun_cents = :budget_fun_cents,
+        budget_groceris_cents = :budget_groceris_cents,
+        budget_travel_cents = :budget_travel_cents,
+        budget_home_exp_cents = :budget_home_exp_cents,
+        budget_misc_cents = :budget_misc_cents
+    WHERE id = 1;
+    """
+)
+
+
+@st.cache_data(ttl=600, show_spinner=False)
 def get_settings() -> dict:
     """Get application settings."""
     engine = get_engine()
-    with engine.begin() as conn:
-        row = (
-            conn.execute(
-                text(
-                    """
-                    SELECT income_1_cents, income_2_cents, saving_goal_pct,
-                           budget_fun_cents, budget_groceris_cents, budget_travel_cents,
-                           budget_home_exp_cents, budget_misc_cents
-                    FROM settings
-                    WHERE id = 1;
-                    """
-                )
-            )
-            .mappings()
-            .first()
-        )
+    with engine.connect() as conn:
+        row = conn.execute(_GET_SETTINGS).mappings().first()
         if not row:
             return {
                 "income_1_cents": 0,
@@ -46,33 +60,25 @@ def save_settings(
     budget_travel: float,
     budget_home_exp: float,
     budget_misc: float,
-) -> None:
-    """Save application settings."""
-    engine = get_engine()
-    with engine.begin() as conn:
-        conn.execute(
-            text(
-                """
-                UPDATE settings
-                SET income_1_cents = :income_1_cents,
-                    income_2_cents = :income_2_cents,
-                    saving_goal_pct = :saving_goal_pct,
-                    budget_fun_cents = :budget_fun_cents,
-                    budget_groceris_cents = :budget_groceris_cents,
-                    budget_travel_cents = :budget_travel_cents,
-                    budget_home_exp_cents = :budget_home_exp_cents,
-                    budget_misc_cents = :budget_misc_cents
-                WHERE id = 1;
-                """
-            ),
-            {
-                "income_1_cents": int(round(income_1 * 100)),
-                "income_2_cents": int(round(income_2 * 100)),
-                "saving_goal_pct": float(saving_goal_pct),
-                "budget_fun_cents": int(round(budget_fun * 100)),
-                "budget_groceris_cents": int(round(budget_groceris * 100)),
-                "budget_travel_cents": int(round(budget_travel * 100)),
-                "budget_home_exp_cents": int(round(budget_home_exp * 100)),
-                "budget_misc_cents": int(round(budget_misc * 100)),
-            },
-        )
+) -> bool:
+    """Save application settings.
+
+    Returns False without writing (or clearing caches) when nothing changed.
+    """
+    params = {
+        "income_1_cents": to_cents(income_1),
+        "income_2_cents": to_cents(income_2),
+        "saving_goal_pct": float(saving_goal_pct),
+        "budget_fun_cents": to_cents(budget_fun),
+        "budget_groceris_cents": to_cents(budget_groceris),
+        "budget_travel_cents": to_cents(budget_travel),
+        "budget_home_exp_cents": to_cents(budget_home_exp),
+        "budget_misc_cents": to_cents(budget_misc),
+    }
+    if params == get_settings():
+        return False
+
+    with begin_write() as conn:
+        conn.execute(_SAVE_SETTINGS, params)
+    clear_query_cache()
+    return True
@@ -1,5 +1,6 @@
 """Tag management models."""
-from sqlalchemy import text
+import streamlit as st
+from sqlalchemy import Integer, String, bindparam, text
 from .database import get_engine, with_sqlite_retry
 
 
@@ -7,38 +8,56 @@ def normalize_tags(values: list[str] | None) -> list[str]:
     """Normalize and deduplicate tags."""
     if not values:
         return []
-    out: list[str] = []
-    seen: set[str] = set()
+    # casefolded key -> first spelling seen; dicts keep insertion order.
+    seen: dict[str, str] = {}
     for v in values:
         name = (v or "").strip()
-        if not name:
-            continue
-        key = name.casefold()
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(name)
-    return out
+        if name:
+            seen.setdefault(name.casefold(), name)
+    return list(seen.values())
 
 
+_LIST_ALL_TAGS = text(
+    """
+    SELECT name
+    FROM tags
+    ORDER BY LOWER(name) ASC
+    LIMIT :limit;
+    """
+)
+
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
 def list_all_tags(limit: int = 500) -> list[str]:
     """Get all tags from database."""
     engine = get_engine()
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT name
-                FROM tags
-                ORDER BY LOWER(name) ASC
-                LIMIT :limit;
-                """
-            ),
-            {"limit": int(limit)},
-        ).mappings().all()
+    with engine.connect() as conn:
+        rows = conn.execute(_LIST_ALL_TAGS, {"limit": int(limit)}).mappings().all()
         return [str(r.get("name") or "") for r in rows if (r.get("name") or "").strip()]
 
 
+# The no-op update on conflict makes RETURNING yield the id of existing tags too.
+_UPSERT_TAG = text(
+    """
+    INSERT INTO tags (name) VALUES (:name)
+    ON CONFLICT (name) DO UPDATE SET name = excluded.name
+    RETURNING id;
+    """
+).bindparams(bindparam("name", type_=String))
+_DELETE_EXPENSE_TAGS = text(
+    "DELETE FROM expense_tags WHERE expense_id = :id;"
+).bindparams(bindparam("id", type_=Integer))
+_INSERT_EXPENSE_TAG = text(
+    """
+    INSERT OR IGNORE INTO expense_tags (expense_id, tag_id)
+    VALUES (:expense_id, :tag_id);
+    """
+).bindparams(
+    bindparam("expense_id", type_=Integer),
+    bindparam("tag_id", type_=Integer),
+)
+
+
 def get_or_create_tag_ids(conn, names: list[str]) -> list[int]:
     """Get or create tag IDs for given tag names."""
     names = normalize_tags(names)
@@ -46,23 +65,9 @@ def get_or_create_tag_ids(conn, names: list[str]) -> list[int]:
         return []
 
     def _op():
-        for n in names:
-            conn.execute(
-                text("INSERT OR IGNORE INTO tags (name) VALUES (:name);"),
-                {"name": n},
-            )
-
-        rows = conn.execute(
-            text(
-                """
-                SELECT id
-                FROM tags
-                WHERE name IN ({placeholders});
-                """.format(placeholders=", ".join([f":n{i}" for i in range(len(names))]))
-            ),
-            {f"n{i}": names[i] for i in range(len(names))},
-        ).mappings().all()
-        return [int(r["id"]) for r in rows]
+        # sqlite3's executemany cannot return rows, so run the one compiled
+        # upsert per name; ids come back in the order of `names`.
+        return [conn.execute(_UPSERT_TAG, {"name": n}).scalar_one() for n in names]
 
     return with_sqlite_retry(_op)
 
@@ -72,19 +77,13 @@ def set_expense_tags(conn, *, expense_id: int, tags: list[str]) -> None:
     tags = normalize_tags(tags)
 
     def _op():
-        conn.execute(text("DELETE FROM expense_tags WHERE expense_id = :id;"), {"id": int(expense_id)})
+        conn.execute(_DELETE_EXPENSE_TAGS, {"id": int(expense_id)})
         if not tags:
             return
         tag_ids = get_or_create_tag_ids(conn, tags)
-        for tid in tag_ids:
-            conn.execute(
-                text(
-                    """
-                    INSERT OR IGNORE INTO expense_tags (expense_id, tag_id)
-                    VALUES (:expense_id, :tag_id);
-                    """
-                ),
-                {"expense_id": int(expense_id), "tag_id": int(tid)},
-            )
+        conn.execute(
+            _INSERT_EXPENSE_TAG,
+            [{"expense_id": int(expense_id), "tag_id": int(tid)} for tid in tag_ids],
+        )
 
     with_sqlite_retry(_op)
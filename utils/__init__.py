@@ -1,13 +1,17 @@
 """Utilities package."""
-from .constants import CATEGORIES, CATEGORY_LABELS, TABS
-from .helpers import category_label, parse_occurred_at, format_ym, format_yw
+from .constants import CATEGORIES, CATEGORY_LABELS, CATEGORY_BUDGET_COLUMNS, CATEGORY_COLORS, TABS, TAB_IDS
+from .helpers import category_label, parse_occurred_at, format_ym, format_yw, to_cents
 
 __all__ = [
     "CATEGORIES",
     "CATEGORY_LABELS",
+    "CATEGORY_BUDGET_COLUMNS",
+    "CATEGORY_COLORS",
     "TABS",
+    "TAB_IDS",
     "category_label",
     "parse_occurred_at",
     "format_ym",
     "format_yw",
+    "to_cents",
 ]
@@ -10,10 +10,29 @@ CATEGORY_LABELS = {
     "misc": "Misc",
 }
 
-TABS = [
+# settings column holding each category's monthly budget.
+CATEGORY_BUDGET_COLUMNS = {
+    "Fun": "budget_fun_cents",
+    "groceris": "budget_groceris_cents",
+    "travel": "budget_travel_cents",
+    "home exp": "budget_home_exp_cents",
+    "misc": "budget_misc_cents",
+}
+
+CATEGORY_COLORS = {
+    "Fun": "#a855f7",
+    "groceris": "#22c55e",
+    "travel": "#06b6d4",
+    "home exp": "#f59e0b",
+    "misc": "#94a3b8",
+}
+
+TABS = (
     ("dashboard", "Dashboard", "\u25A3"),
     ("transactions", "Transactions", "\u2630"),
     ("add", "", "+"),
     ("analytics", "Analytics", "\u25D4"),
     ("settings", "Settings", "\u2699"),
-]
+)
+
+TAB_IDS = frozenset(t[0] for t in TABS)
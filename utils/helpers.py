@@ -1,14 +1,40 @@
 """Helper utility functions."""
 import datetime as dt
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
 from .constants import CATEGORY_LABELS
 
 
+_CENT = Decimal("0.01")
+
+
+def to_cents(amount: float | int | str | Decimal) -> int:
+    """Convert a currency amount to integer cents, rounding half up to the nearest cent.
+
+    Floats go through their shortest repr, so 1.005 becomes 101 cents rather
+    than the 100 that float multiplication would give.
+    """
+    if isinstance(amount, int):
+        return amount * 100
+    return int(Decimal(str(amount)).quantize(_CENT, rounding=ROUND_HALF_UP) * 100)
+
+
+# Exact-match labels, including the blank/None cases, so the common lookup is
+# a single dict hit with no stripping.
+_LABELS = {**CATEGORY_LABELS, "": "Misc", None: "Misc"}
+
+
 def category_label(cat: str) -> str:
     """Get display label for category."""
+    label = _LABELS.get(cat)
+    if label is not None:
+        return label
     c = (cat or "").strip()
-    return CATEGORY_LABELS.get(c, c or "Misc")
+    return _LABELS.get(c, c or "Misc")
 
 
+# Pure string -> value helpers called per row; results are immutable, so memoize.
+@lru_cache(maxsize=4096)
 def parse_occurred_at(value: str) -> dt.datetime:
     """Parse occurred_at timestamp."""
     try:
@@ -20,6 +46,7 @@ def parse_occurred_at(value: str) -> dt.datetime:
             return dt.datetime(1970, 1, 1)
 
 
+@lru_cache(maxsize=256)
 def format_ym(ym: str) -> str:
     """Format year-month string."""
     try:
@@ -29,6 +56,7 @@ def format_ym(ym: str) -> str:
         return ym
 
 
+@lru_cache(maxsize=256)
 def format_yw(yw: str) -> str:
     """Format year-week string."""
     try:
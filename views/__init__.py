@@ -1,16 +1,24 @@
-"""Views package for UI components."""
-from .dashboard import render_dashboard
-from .add import render_add
-from .transactions import render_transactions
-from .analytics import render_analytics
-from .settings import render_settings
-from .navigation import render_bottom_nav
+"""Views package for UI components.
 
-__all__ = [
-    "render_dashboard",
-    "render_add",
-    "render_transactions",
-    "render_analytics",
-    "render_settings",
-    "render_bottom_nav",
-]
+View modules are imported on first access, so a run only pays the import
+cost (Plotly, for the chart views) of the tab it actually renders.
+"""
+import importlib
+
+_EXPORTS = {
+    "render_dashboard": ".dashboard",
+    "render_add": ".add",
+    "render_transactions": ".transactions",
+    "render_analytics": ".analytics",
+    "render_settings": ".settings",
+    "render_bottom_nav": ".navigation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
@@ -45,7 +45,7 @@ def render_add():
         with c2:
             category = st.radio("Category", CATEGORIES, horizontal=True, format_func=category_label)
 
-        st.markdown("---")
+        st.divider()
         st.markdown("### 🏷️ Tags")
         st.caption("Add tags to categorize this expense (optional)")
         
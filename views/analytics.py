@@ -6,10 +6,23 @@ from models.analytics import monthly_totals, monthly_category_totals, get_kpi_me
 from models.settings import get_settings
 from models.tag_analytics import tag_spending_over_time, top_tags_by_spending
 from models.tags import list_all_tags
-from utils.constants import CATEGORIES
+from utils.constants import CATEGORIES, CATEGORY_COLORS
 from utils.helpers import category_label, format_ym
 
 
+# Fixed per-category trace properties for the stacked area chart, built once.
+_AREA_TRACE_STYLE = {
+    cat: dict(
+        name=category_label(cat),
+        mode="lines",
+        line=dict(color=CATEGORY_COLORS[cat], width=2),
+        stackgroup="one",
+        hovertemplate=f"<b>{category_label(cat)}</b><br>%{{x}}: $%{{y:,.0f}}<extra></extra>",
+    )
+    for cat in CATEGORIES
+}
+
+
 def render_analytics():
     """Render analytics tab with filters and KPIs."""
     st.markdown("""
@@ -65,66 +78,10 @@ def render_analytics():
     if savings_data and target_savings_pct > 0:
         st.markdown("### 💰 Savings Rate Trend")
         
-        x = [format_ym(r["ym"]) for r in savings_data]
-        y_actual = [r["savings_rate"] for r in savings_data]
-        y_target = [target_savings_pct] * len(x)
-        
-        fig_savings = go.Figure()
-        
-        # Target line
-        fig_savings.add_trace(
-            go.Scatter(
-                x=x,
-                y=y_target,
-                mode="lines",
-                name="Target",
-                line=dict(color="#94a3b8", width=2, dash="dash"),
-                hovertemplate="<b>Target</b><br>%{y:.1f}%<extra></extra>",
-            )
-        )
-        
-        # Actual savings rate
-        fig_savings.add_trace(
-            go.Scatter(
-                x=x,
-                y=y_actual,
-                mode="lines+markers",
-                name="Actual",
-                line=dict(color="#10b981", width=3),
-                marker=dict(size=8, symbol="circle"),
-                fill="tonexty",
-                fillcolor="rgba(16,185,129,0.1)",
-                hovertemplate="<b>%{x}</b><br>Savings: %{y:.1f}%<extra></extra>",
-            )
-        )
-        
-        fig_savings.update_layout(
-            template="plotly_dark",
-            margin=dict(l=20, r=20, t=20, b=20),
-            height=260,
-            paper_bgcolor="rgba(0,0,0,0)",
-            plot_bgcolor="rgba(0,0,0,0)",
-            xaxis=dict(
-                type="category",
-                tickangle=0,
-                tickfont=dict(size=11),
-                showgrid=False
-            ),
-            yaxis=dict(
-                title="Savings %",
-                gridcolor="rgba(255,255,255,0.08)",
-                ticksuffix="%",
-                tickfont=dict(size=11)
-            ),
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1,
-                font=dict(size=10)
-            ),
+        fig_savings = _savings_figure(
+            tuple(format_ym(r["ym"]) for r in savings_data),
+            tuple(r["savings_rate"] for r in savings_data),
+            target_savings_pct,
         )
         
         st.plotly_chart(fig_savings, use_container_width=True, config={"displayModeBar": False})
@@ -144,7 +101,7 @@ def render_analytics():
             with col3:
                 st.metric("Target", f"{target_savings_pct:.1f}%")
         
-        st.markdown("---")
+        st.divider()
     
     # Get KPI metrics
     kpis = get_kpi_metrics(start_date=start_date, end_date=end_date, search=search_query)
@@ -172,179 +129,264 @@ def render_analytics():
         with kpi_cols[3]:
             st.metric("Avg/Day", f"${avg_daily:,.0f}")
         
-        st.markdown("---")
+        st.divider()
         
         # Monthly Trend Chart
         mom = monthly_totals(limit=12, start_date=start_date, end_date=end_date, search=search_query)
         
         if mom:
             with st.expander("📈 Monthly Trend", expanded=True):
-                x = [format_ym(r["ym"]) for r in mom]
-                y = [(int(r["total_cents"] or 0) / 100.0) for r in mom]
-                
-                fig_mom = go.Figure(
-                    data=[
-                        go.Scatter(
-                            x=x,
-                            y=y,
-                            mode="lines+markers",
-                            line=dict(color="#3b82f6", width=3),
-                            marker=dict(size=8, symbol="circle"),
-                            fill="tozeroy",
-                            fillcolor="rgba(59,130,246,0.15)",
-                            hovertemplate="<b>%{x}</b><br>$%{y:,.0f}<extra></extra>",
-                        )
-                    ]
-                )
-                fig_mom.update_layout(
-                    template="plotly_dark",
-                    margin=dict(l=20, r=20, t=20, b=20),
-                    height=280,
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    xaxis=dict(
-                        type="category",
-                        tickangle=0,
-                        tickfont=dict(size=11),
-                        showgrid=False
-                    ),
-                    yaxis=dict(
-                        title="",
-                        gridcolor="rgba(255,255,255,0.08)",
-                        tickprefix="$",
-                        tickfont=dict(size=11)
-                    ),
+                fig_mom = _monthly_trend_figure(
+                    tuple(format_ym(r["ym"]) for r in mom),
+                    tuple(int(r["total_cents"] or 0) / 100.0 for r in mom),
                 )
                 st.plotly_chart(fig_mom, use_container_width=True, config={"displayModeBar": False})
         
         # Category Breakdown
-        mom_cat = monthly_category_totals(limit_months=6, start_date=start_date, end_date=end_date)
+        fig_area = _category_area_figure(start_date, end_date)
         
-        if mom_cat:
+        if fig_area:
             with st.expander("🎨 Category Breakdown", expanded=False):
-                months = sorted({r["ym"] for r in mom_cat})
-                months_fmt = [format_ym(m) for m in months]
-                by_cat: dict[str, dict[str, float]] = {c: {m: 0.0 for m in months} for c in CATEGORIES}
-                for r in mom_cat:
-                    cat = r.get("category") or "misc"
-                    if cat in by_cat:
-                        by_cat[cat][r["ym"]] = float(int(r.get("total_cents") or 0) / 100.0)
-                
-                colors = {
-                    "Fun": "#a855f7",
-                    "groceris": "#22c55e",
-                    "travel": "#06b6d4",
-                    "home exp": "#f59e0b",
-                    "misc": "#94a3b8",
-                }
-                
-                fig_area = go.Figure()
-                for cat in CATEGORIES:
-                    fig_area.add_trace(
-                        go.Scatter(
-                            name=category_label(cat),
-                            x=months_fmt,
-                            y=[by_cat[cat][m] for m in months],
-                            mode="lines",
-                            line=dict(color=colors.get(cat, "#94a3b8"), width=2),
-                            stackgroup="one",
-                            hovertemplate=f"<b>{category_label(cat)}</b><br>%{{x}}: $%{{y:,.0f}}<extra></extra>",
-                        )
-                    )
-                
-                fig_area.update_layout(
-                    template="plotly_dark",
-                    margin=dict(l=20, r=20, t=20, b=20),
-                    height=300,
-                    showlegend=True,
-                    legend=dict(
-                        orientation="h",
-                        yanchor="bottom",
-                        y=1.02,
-                        xanchor="left",
-                        x=0,
-                        font=dict(size=10)
-                    ),
-                    paper_bgcolor="rgba(0,0,0,0)",
-                    plot_bgcolor="rgba(0,0,0,0)",
-                    xaxis=dict(
-                        type="category",
-                        tickangle=0,
-                        tickfont=dict(size=11),
-                        showgrid=False
-                    ),
-                    yaxis=dict(
-                        title="",
-                        gridcolor="rgba(255,255,255,0.08)",
-                        tickprefix="$",
-                        tickfont=dict(size=11)
-                    ),
-                )
                 st.plotly_chart(fig_area, use_container_width=True, config={"displayModeBar": False})
         
         # Tag Analytics
         all_tags = list_all_tags()
         if all_tags:
-            with st.expander("🏷️ Tag Analytics", expanded=False):
-                top_tags = top_tags_by_spending(limit=5)
-                
-                if top_tags:
-                    st.caption("Top Tags")
-                    top_cols = st.columns(min(len(top_tags), 3))
-                    for idx, tag_data in enumerate(top_tags[:3]):
-                        with top_cols[idx]:
-                            tag_name = tag_data.get("tag_name", "")
-                            total = (int(tag_data.get("total_cents", 0)) / 100.0)
-                            count = int(tag_data.get("transaction_count", 0))
-                            st.metric(f"#{tag_name}", f"${total:,.0f}", f"{count} txns")
-                
-                st.markdown("")
-                selected_tag = st.selectbox(
-                    "View tag trend",
-                    options=all_tags,
-                    key="tag_analytics_selector",
-                )
-                
-                if selected_tag:
-                    tag_data = tag_spending_over_time(selected_tag, limit_months=12)
-                    
-                    if tag_data:
-                        x = [format_ym(r["ym"]) for r in tag_data]
-                        y = [(int(r["total_cents"] or 0) / 100.0) for r in tag_data]
-                        
-                        fig_tag = go.Figure(
-                            data=[
-                                go.Scatter(
-                                    x=x,
-                                    y=y,
-                                    mode="lines+markers",
-                                    line=dict(color="#8b5cf6", width=3),
-                                    marker=dict(size=7),
-                                    fill="tozeroy",
-                                    fillcolor="rgba(139,92,246,0.12)",
-                                    hovertemplate="<b>%{x}</b><br>$%{y:,.0f}<extra></extra>",
-                                )
-                            ]
-                        )
-                        fig_tag.update_layout(
-                            template="plotly_dark",
-                            margin=dict(l=20, r=20, t=10, b=20),
-                            height=240,
-                            paper_bgcolor="rgba(0,0,0,0)",
-                            plot_bgcolor="rgba(0,0,0,0)",
-                            xaxis=dict(
-                                type="category",
-                                tickangle=0,
-                                tickfont=dict(size=10),
-                                showgrid=False
-                            ),
-                            yaxis=dict(
-                                title="",
-                                gridcolor="rgba(255,255,255,0.08)",
-                                tickprefix="$",
-                                tickfont=dict(size=10)
-                            ),
-                        )
-                        st.plotly_chart(fig_tag, use_container_width=True, config={"displayModeBar": False})
+            _render_tag_analytics(all_tags)
     else:
         st.info("📝 No data available for the selected filters. Add some expenses to see analytics!")
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _savings_figure(x: tuple, y_actual: tuple, target_pct: float) -> dict:
+    """Build the savings-rate trend against its target as a plain figure dict."""
+    fig_savings = go.Figure(
+        data=[
+            # Target line
+            go.Scatter(
+                x=x,
+                y=[target_pct] * len(x),
+                mode="lines",
+                name="Target",
+                line=dict(color="#94a3b8", width=2, dash="dash"),
+                hovertemplate="<b>Target</b><br>%{y:.1f}%<extra></extra>",
+            ),
+            # Actual savings rate
+            go.Scatter(
+                x=x,
+                y=y_actual,
+                mode="lines+markers",
+                name="Actual",
+                line=dict(color="#10b981", width=3),
+                marker=dict(size=8, symbol="circle"),
+                fill="tonexty",
+                fillcolor="rgba(16,185,129,0.1)",
+                hovertemplate="<b>%{x}</b><br>Savings: %{y:.1f}%<extra></extra>",
+            ),
+        ]
+    )
+
+    fig_savings.update_layout(
+        uirevision="savings",
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=260,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(
+            type="category",
+            tickangle=0,
+            tickfont=dict(size=11),
+            showgrid=False
+        ),
+        yaxis=dict(
+            title="Savings %",
+            gridcolor="rgba(255,255,255,0.08)",
+            ticksuffix="%",
+            tickfont=dict(size=11)
+        ),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1,
+            font=dict(size=10)
+        ),
+    )
+    return fig_savings.to_dict()
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _monthly_trend_figure(x: tuple, y: tuple) -> dict:
+    """Build the monthly spending trend as a plain figure dict."""
+    fig_mom = go.Figure(
+        data=[
+            go.Scatter(
+                x=x,
+                y=y,
+                mode="lines+markers",
+                line=dict(color="#3b82f6", width=3),
+                marker=dict(size=8, symbol="circle"),
+                fill="tozeroy",
+                fillcolor="rgba(59,130,246,0.15)",
+                hovertemplate="<b>%{x}</b><br>$%{y:,.0f}<extra></extra>",
+            )
+        ]
+    )
+    fig_mom.update_layout(
+        uirevision="monthly_trend",
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=280,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(
+            type="category",
+            tickangle=0,
+            tickfont=dict(size=11),
+            showgrid=False
+        ),
+        yaxis=dict(
+            title="",
+            gridcolor="rgba(255,255,255,0.08)",
+            tickprefix="$",
+            tickfont=dict(size=11)
+        ),
+    )
+    return fig_mom.to_dict()
+
+
+@st.cache_data(ttl=30, max_entries=128, show_spinner=False)
+def _category_area_figure(start_date: dt.date | None, end_date: dt.date | None) -> dict | None:
+    """Build the stacked category area chart as a plain figure dict.
+
+    Cached like the queries it reads, so reruns that leave the date window
+    unchanged skip rebuilding and validating the traces.
+    """
+    mom_cat = monthly_category_totals(limit_months=6, start_date=start_date, end_date=end_date)
+    if not mom_cat:
+        return None
+
+    # Rows are dense and ordered by CATEGORIES, then month.
+    n_months = len(mom_cat) // len(CATEGORIES)
+    months_fmt = [format_ym(r["ym"]) for r in mom_cat[:n_months]]
+
+    # Stacked areas need SVG Scatter (Scattergl has no stackgroup); build
+    # all traces first so the figure is validated once, not per add_trace.
+    fig_area = go.Figure(
+        data=[
+            go.Scatter(
+                x=months_fmt,
+                y=[r["total_cents"] / 100.0 for r in mom_cat[i * n_months:(i + 1) * n_months]],
+                **_AREA_TRACE_STYLE[cat],
+            )
+            for i, cat in enumerate(CATEGORIES)
+        ]
+    )
+
+    fig_area.update_layout(
+        uirevision="category_area",
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=20, b=20),
+        height=300,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="left",
+            x=0,
+            font=dict(size=10)
+        ),
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(
+            type="category",
+            tickangle=0,
+            tickfont=dict(size=11),
+            showgrid=False
+        ),
+        yaxis=dict(
+            title="",
+            gridcolor="rgba(255,255,255,0.08)",
+            tickprefix="$",
+            tickfont=dict(size=11)
+        ),
+    )
+    return fig_area.to_dict()
+
+
+@st.fragment
+def _render_tag_analytics(all_tags: list[str]):
+    """Render top tags and a per-tag trend; picking a tag reruns only this section."""
+    with st.expander("🏷️ Tag Analytics", expanded=False):
+        top_tags = top_tags_by_spending(limit=5)
+
+        if top_tags:
+            st.caption("Top Tags")
+            top_cols = st.columns(min(len(top_tags), 3))
+            for idx, tag_data in enumerate(top_tags[:3]):
+                with top_cols[idx]:
+                    tag_name = tag_data.get("tag_name", "")
+                    total = (int(tag_data.get("total_cents", 0)) / 100.0)
+                    count = int(tag_data.get("transaction_count", 0))
+                    st.metric(f"#{tag_name}", f"${total:,.0f}", f"{count} txns")
+
+        st.markdown("")
+        selected_tag = st.selectbox(
+            "View tag trend",
+            options=all_tags,
+            key="tag_analytics_selector",
+        )
+
+        if selected_tag:
+            tag_data = tag_spending_over_time(selected_tag, limit_months=12)
+
+            if tag_data:
+                fig_tag = _tag_trend_figure(
+                    tuple(format_ym(r["ym"]) for r in tag_data),
+                    tuple(int(r["total_cents"] or 0) / 100.0 for r in tag_data),
+                )
+                st.plotly_chart(fig_tag, use_container_width=True, config={"displayModeBar": False})
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _tag_trend_figure(x: tuple, y: tuple) -> dict:
+    """Build one tag's monthly spending trend as a plain figure dict."""
+    fig_tag = go.Figure(
+        data=[
+            go.Scatter(
+                x=x,
+                y=y,
+                mode="lines+markers",
+                line=dict(color="#8b5cf6", width=3),
+                marker=dict(size=7),
+                fill="tozeroy",
+                fillcolor="rgba(139,92,246,0.12)",
+                hovertemplate="<b>%{x}</b><br>$%{y:,.0f}<extra></extra>",
+            )
+        ]
+    )
+    fig_tag.update_layout(
+        uirevision="tag_trend",
+        template="plotly_dark",
+        margin=dict(l=20, r=20, t=10, b=20),
+        height=240,
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="rgba(0,0,0,0)",
+        xaxis=dict(
+            type="category",
+            tickangle=0,
+            tickfont=dict(size=10),
+            showgrid=False
+        ),
+        yaxis=dict(
+            title="",
+            gridcolor="rgba(255,255,255,0.08)",
+            tickprefix="$",
+            tickfont=dict(size=10)
+        ),
+    )
+    return fig_tag.to_dict()
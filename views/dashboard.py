@@ -3,9 +3,9 @@ import datetime as dt
 import calendar
 import streamlit as st
 import plotly.graph_objects as go
-from models.expense import spent_by_category_for_month, spent_total_for_month
+from models.expense import spent_by_category_and_total
 from models.settings import get_settings
-from utils.constants import CATEGORIES
+from utils.constants import CATEGORIES, CATEGORY_BUDGET_COLUMNS, CATEGORY_COLORS
 from utils.helpers import category_label
 
 
@@ -39,6 +39,12 @@ def render_dashboard():
     """, unsafe_allow_html=True)
 
     settings = get_settings()
+    spent_by_cat, spent_total_cents = spent_by_category_and_total(today)
+    _render_budget(settings, spent_by_cat, spent_total_cents)
+
+
+def _render_budget(settings: dict, spent_by_cat: dict, spent_total_cents: int):
+    """Render the budget donut and per-category progress from cached inputs."""
     income_1 = (settings.get("income_1_cents", 0) or 0) / 100.0
     income_2 = (settings.get("income_2_cents", 0) or 0) / 100.0
     saving_goal_pct = float(settings.get("saving_goal_pct", 0.0) or 0.0)
@@ -46,47 +52,13 @@ def render_dashboard():
     total_income = income_1 + income_2
     spending_budget = total_income * (1.0 - (saving_goal_pct / 100.0))
 
-    spent = spent_total_for_month(today) / 100.0
-    remaining = max(spending_budget - spent, 0.0)
-
+    spent = spent_total_cents / 100.0
     budget = max(spending_budget, 0.0)
     spent_clamped = min(max(spent, 0.0), budget) if budget > 0 else 0.0
     remaining_clamped = max(budget - spent_clamped, 0.0)
 
-    fig = go.Figure(
-        data=[
-            go.Pie(
-                values=[spent_clamped, remaining_clamped],
-                hole=0.75,
-                sort=False,
-                direction="clockwise",
-                rotation=90,
-                marker={
-                    "colors": ["#f87171", "#34d399"],
-                    "line": {"color": "rgba(255,255,255,0.8)", "width": 3}
-                },
-                textinfo="none",
-                hovertemplate="<b>%{label}</b><br>$%{value:,.0f}<extra></extra>",
-                labels=["Spent", "Remaining"],
-            )
-        ]
-    )
-    fig.update_layout(
-        margin=dict(l=0, r=0, t=0, b=0),
-        height=320,
-        showlegend=False,
-        paper_bgcolor="rgba(0,0,0,0)",
-        annotations=[
-            dict(
-                text=f"<b style='font-size:32px'>${remaining:,.0f}</b><br><span style='font-size:14px; opacity:0.8'>remaining</span>",
-                x=0.5,
-                y=0.5,
-                font=dict(size=16, color="#ffffff"),
-                showarrow=False,
-                align="center"
-            )
-        ],
-    )
+    # The donut only shows whole dollars, so key its cached figure on them.
+    fig = _donut_figure(round(spent_clamped), round(remaining_clamped))
     st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
     st.markdown("""
@@ -98,32 +70,14 @@ def render_dashboard():
         font-weight: 600;
     ">Categories</h3>
     """, unsafe_allow_html=True)
-    
-    spent_by_cat = spent_by_category_for_month(today)
-
-    budgets = {
-        "Fun": (settings.get("budget_fun_cents", 0) or 0) / 100.0,
-        "groceris": (settings.get("budget_groceris_cents", 0) or 0) / 100.0,
-        "travel": (settings.get("budget_travel_cents", 0) or 0) / 100.0,
-        "home exp": (settings.get("budget_home_exp_cents", 0) or 0) / 100.0,
-        "misc": (settings.get("budget_misc_cents", 0) or 0) / 100.0,
-    }
-    
-    cat_colors = {
-        "Fun": "#a855f7",
-        "groceris": "#22c55e",
-        "travel": "#06b6d4",
-        "home exp": "#f59e0b",
-        "misc": "#94a3b8",
-    }
 
     for cat in CATEGORIES:
-        allocated = float(budgets.get(cat, 0.0) or 0.0)
+        allocated = (settings.get(CATEGORY_BUDGET_COLUMNS[cat], 0) or 0) / 100.0
         used = (spent_by_cat.get(cat, 0) or 0) / 100.0
         remaining_cat = max(allocated - used, 0.0)
         ratio = 0.0 if allocated <= 0 else min(max(used / allocated, 0.0), 1.0)
         
-        color = cat_colors.get(cat, "#94a3b8")
+        color = CATEGORY_COLORS[cat]
 
         st.markdown(f"""
         <div style="
@@ -141,3 +95,43 @@ def render_dashboard():
         </div>
         """, unsafe_allow_html=True)
         st.progress(ratio)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _donut_figure(spent: int, remaining: int) -> dict:
+    """Build the spent/remaining donut as a plain figure dict."""
+    fig = go.Figure(
+        data=[
+            go.Pie(
+                values=[spent, remaining],
+                hole=0.75,
+                sort=False,
+                direction="clockwise",
+                rotation=90,
+                marker={
+                    "colors": ["#f87171", "#34d399"],
+                    "line": {"color": "rgba(255,255,255,0.8)", "width": 3}
+                },
+                textinfo="none",
+                hovertemplate="<b>%{label}</b><br>$%{value:,.0f}<extra></extra>",
+                labels=["Spent", "Remaining"],
+            )
+        ]
+    )
+    fig.update_layout(
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=320,
+        showlegend=False,
+        paper_bgcolor="rgba(0,0,0,0)",
+        annotations=[
+            dict(
+                text=f"<b style='font-size:32px'>${remaining:,}</b><br><span style='font-size:14px; opacity:0.8'>remaining</span>",
+                x=0.5,
+                y=0.5,
+                font=dict(size=16, color="#ffffff"),
+                showarrow=False,
+                align="center"
+            )
+        ],
+    )
+    return fig.to_dict()
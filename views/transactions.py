@@ -1,10 +1,22 @@
 """Transactions view."""
 import datetime as dt
+from itertools import groupby
 import streamlit as st
-from models.expense import list_transactions, get_expense, update_expense, delete_expense
+from models.expense import Transaction, count_transactions, list_transactions, update_expenses_bulk, delete_expenses
 from models.tags import list_all_tags, normalize_tags
 from utils.constants import CATEGORIES
-from utils.helpers import category_label, parse_occurred_at
+from utils.helpers import parse_occurred_at
+
+
+_EDITOR_COLUMNS = {
+    "date": st.column_config.DateColumn("Date", format="YYYY-MM-DD", required=True),
+    "item": st.column_config.TextColumn("Item", required=True),
+    "category": st.column_config.SelectboxColumn("Category", options=CATEGORIES, required=True),
+    "amount": st.column_config.NumberColumn("Amount", min_value=0.0, step=0.01, format="%.2f", required=True),
+    "tags": st.column_config.TextColumn("Tags", help="Comma separated"),
+    "delete": st.column_config.CheckboxColumn("Delete", default=False),
+}
+_PAGE_SIZE = 50
 
 
 def render_transactions():
@@ -53,151 +65,123 @@ def render_transactions():
     if isinstance(dr, tuple) and len(dr) == 2:
         start_date, end_date = dr
 
-    rows = list_transactions(search=search, limit=1000, start_date=start_date, end_date=end_date, tag=(tag_choice or None))
-    if not rows:
+    # list_transactions matches case-insensitively; normalize here so "Milk " and
+    # "milk" share one cache entry.
+    filters = {
+        "search": search.strip().lower(),
+        "start_date": start_date,
+        "end_date": end_date,
+        "tag": tag_choice or None,
+    }
+    _render_transaction_list(filters)
+
+
+@st.fragment
+def _render_transaction_list(filters: dict):
+    """Render the paged month editors; paging and saving rerun only this fragment."""
+    # New tags change the Tag filter's options, which live outside the fragment.
+    if st.session_state.pop("_tx_tags_changed", False):
+        st.rerun()
+
+    total = count_transactions(**filters)
+    if not total:
         st.caption("No transactions.")
-    else:
-        groups: dict[str, list[dict]] = {}
-        for r in rows:
-            occurred = parse_occurred_at(r.get("occurred_at") or "")
-            key = occurred.strftime("%B %Y")
-            groups.setdefault(key, []).append({**dict(r), "_occurred": occurred})
-
-        for month_label, items in groups.items():
-            subtotal_cents = sum(int(i.get("amount_cents") or 0) for i in items)
-            st.markdown(f"### {month_label}")
-            st.caption(f"Subtotal: {(subtotal_cents / 100.0):,.2f}")
-
-            for i in items:
-                expense_id = int(i.get("id") or 0)
-                d = i["_occurred"].date().isoformat()
-                note = (i.get("note") or "").strip() or "(no item)"
-                category = (i.get("category") or "misc").strip()
-                amount = (int(i.get("amount_cents") or 0) / 100.0)
-                tags_text = (i.get("tags") or "").strip()
-
-                c1, c2, c3, c4 = st.columns([1.2, 2.3, 0.9, 0.9])
-                with c1:
-                    st.caption(d)
-                with c2:
-                    st.write(f"**{note}**")
-                    if tags_text:
-                        st.caption(f"{category_label(category)} · {tags_text}")
-                    else:
-                        st.caption(category_label(category))
-                with c3:
-                    st.write(f"{amount:,.2f}")
-                with c4:
-                    a1, a2 = st.columns([1, 1], gap="small")
-                    with a1:
-                        edit_clicked = st.button(
-                            "✏️",
-                            key=f"edit_{expense_id}",
-                            help="Edit",
-                            use_container_width=True,
-                        )
-                    with a2:
-                        delete_clicked = st.button(
-                            "🗑️",
-                            key=f"delete_{expense_id}",
-                            help="Delete",
-                            use_container_width=True,
-                        )
-
-                if edit_clicked:
-                    st.session_state["_editing_expense_id"] = expense_id
-
-                if delete_clicked:
-                    st.session_state["_deleting_expense_id"] = expense_id
-
-                if st.session_state.get("_deleting_expense_id") == expense_id:
-                    dc1, dc2, _ = st.columns([1, 1, 3])
-                    with dc1:
-                        if st.button("Confirm delete", key=f"confirm_delete_{expense_id}"):
-                            delete_expense(expense_id)
-                            st.session_state.pop("_deleting_expense_id", None)
-                            st.session_state.pop("_editing_expense_id", None)
-                            st.rerun()
-                    with dc2:
-                        if st.button("Cancel", key=f"cancel_delete_{expense_id}"):
-                            st.session_state.pop("_deleting_expense_id", None)
-
-                if st.session_state.get("_editing_expense_id") == expense_id:
-                    existing = get_expense(expense_id)
-                    if existing:
-                        with st.form(f"edit_form_{expense_id}"):
-                            st.caption("Edit transaction")
-                            occurred_dt = parse_occurred_at(existing.get("occurred_at") or "")
-                            edit_date = st.date_input(
-                                "Date",
-                                value=occurred_dt.date(),
-                                key=f"edit_date_{expense_id}",
-                            )
-                            edit_item = st.text_input(
-                                "Item",
-                                value=(existing.get("note") or "").strip(),
-                                key=f"edit_item_{expense_id}",
-                            )
-                            edit_amount = st.number_input(
-                                "Amount",
-                                min_value=0.0,
-                                step=1.0,
-                                format="%.2f",
-                                value=(int(existing.get("amount_cents") or 0) / 100.0),
-                                key=f"edit_amount_{expense_id}",
-                            )
-                            edit_category = st.selectbox(
-                                "Category",
-                                options=CATEGORIES,
-                                index=CATEGORIES.index((existing.get("category") or "misc").strip())
-                                if (existing.get("category") or "misc").strip() in CATEGORIES
-                                else CATEGORIES.index("misc"),
-                                format_func=category_label,
-                                key=f"edit_category_{expense_id}",
-                            )
-
-                            existing_tags = list(existing.get("tags") or [])
-                            edit_tags_selected = st.multiselect(
-                                "Tags",
-                                options=all_tags,
-                                default=[t for t in existing_tags if t in all_tags],
-                                key=f"edit_tags_{expense_id}",
-                            )
-                            edit_custom_tags = st.text_input(
-                                "Or add new tags (comma-separated)",
-                                value=", ".join([t for t in existing_tags if t not in all_tags]),
-                                key=f"edit_custom_tags_{expense_id}",
-                                placeholder="Comma separated",
-                            )
-
-                            ec1, ec2 = st.columns([1, 1])
-                            with ec1:
-                                submitted = st.form_submit_button("Save")
-                            with ec2:
-                                cancel = st.form_submit_button("Cancel")
-
-                        if cancel:
-                            st.session_state.pop("_editing_expense_id", None)
-                            st.rerun()
-
-                        if submitted:
-                            if not (edit_item or "").strip():
-                                st.error("Please enter an item name.")
-                            elif float(edit_amount) <= 0:
-                                st.error("Please enter an amount greater than 0.")
-                            else:
-                                final_tags = list(edit_tags_selected)
-                                if edit_custom_tags.strip():
-                                    new_tags = [t.strip() for t in edit_custom_tags.split(",") if t.strip()]
-                                    final_tags.extend(new_tags)
-                                
-                                update_expense(
-                                    expense_id=expense_id,
-                                    item_name=str(edit_item),
-                                    amount=float(edit_amount),
-                                    category=str(edit_category),
-                                    occurred_on=edit_date,
-                                    tags=normalize_tags(final_tags),
-                                )
-                                st.session_state.pop("_editing_expense_id", None)
-                                st.rerun()
+        return
+
+    pages = -(-total // _PAGE_SIZE)
+    page = 1
+    if pages > 1:
+        page = int(st.number_input("Page", min_value=1, max_value=pages, value=1, step=1))
+        st.caption(f"Page {page} of {pages} · {total} transactions")
+    rows = list_transactions(limit=_PAGE_SIZE, offset=(page - 1) * _PAGE_SIZE, **filters)
+
+    # Editors are keyed by a revision so a successful save starts them fresh.
+    rev = st.session_state.get("_tx_editor_rev", 0)
+    editors: list[tuple[str, list[Transaction]]] = []
+    with st.form("tx_editor_form", border=False):
+        for ym, group in groupby(rows, key=lambda r: r.ym):
+            items = list(group)
+            first = items[0]
+            st.markdown(f"### {parse_occurred_at(first.occurred_at or '').strftime('%B %Y')}")
+            st.caption(f"Subtotal: {(int(first.month_subtotal or 0) / 100.0):,.2f}")
+
+            key = f"tx_editor_{ym}_{page}_{rev}"
+            st.data_editor(
+                [_editor_row(i) for i in items],
+                key=key,
+                column_config=_EDITOR_COLUMNS,
+                column_order=tuple(_EDITOR_COLUMNS),
+                hide_index=True,
+                num_rows="fixed",
+                use_container_width=True,
+            )
+            editors.append((key, items))
+
+        # Saving in the callback lands before this fragment reruns, so the
+        # rerun already reads the updated rows.
+        st.form_submit_button("Save changes", type="primary", on_click=_save_edits, args=(editors,))
+
+    for e in st.session_state.pop("_tx_editor_errors", ()):
+        st.error(e)
+
+
+def _editor_row(r: Transaction) -> dict:
+    """Map a transaction row to the editor's columns."""
+    return {
+        "date": parse_occurred_at(r.occurred_at or "").date(),
+        "item": (r.note or "").strip(),
+        "category": (r.category or "misc").strip(),
+        "amount": int(r.amount_cents or 0) / 100.0,
+        "tags": (r.tags or "").strip(),
+        "delete": False,
+    }
+
+
+def _save_edits(editors: list[tuple[str, list[Transaction]]]) -> None:
+    """Submit callback: apply all editors' pending changes as one batched update and delete."""
+    updates: list[dict] = []
+    deletes: list[int] = []
+    errors: list[str] = []
+    for key, items in editors:
+        edited_rows = (st.session_state.get(key) or {}).get("edited_rows", {})
+        for idx, changes in edited_rows.items():
+            row = items[int(idx)]
+            expense_id = int(row.id)
+            if changes.get("delete"):
+                deletes.append(expense_id)
+                continue
+            if set(changes) <= {"delete"}:
+                continue
+
+            merged = {**_editor_row(row), **changes}
+            item = (merged.get("item") or "").strip()
+            amount = float(merged.get("amount") or 0)
+            if not item:
+                errors.append("Please enter an item name.")
+                continue
+            if amount <= 0:
+                errors.append(f"Please enter an amount greater than 0 for {item}.")
+                continue
+
+            update = {
+                "expense_id": expense_id,
+                "item_name": item,
+                "amount": amount,
+                "category": str(merged.get("category") or "misc"),
+                "occurred_on": dt.date.fromisoformat(str(merged["date"])[:10]),
+            }
+            if "tags" in changes:
+                update["tags"] = normalize_tags((changes.get("tags") or "").split(","))
+            updates.append(update)
+
+    if errors:
+        st.session_state["_tx_editor_errors"] = list(dict.fromkeys(errors))
+        return
+
+    if updates:
+        update_expenses_bulk(updates)
+    if deletes:
+        delete_expenses(deletes)
+    if updates or deletes:
+        st.session_state["_tx_editor_rev"] = st.session_state.get("_tx_editor_rev", 0) + 1
+        st.session_state["_tx_tags_changed"] = any("tags" in u for u in updates)